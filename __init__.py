@@ -8,6 +8,17 @@ V3 nodes provide improved UI with proper slider controls.
 # Web directory for custom JavaScript extensions
 WEB_DIRECTORY = "./web"
 
+
+def _start_kernel_warm_up():
+    """Compile the optional Numba kernels in the background so the first node run doesn't pay for it."""
+    try:
+        from .utils import warm_up_in_background
+        from . import interactive_filters, pattern_generators
+        warm_up_in_background(interactive_filters.warm_up_kernels, pattern_generators.warm_up_kernels)
+    except Exception as e:
+        print(f"[Purz] Numba warm-up not started, kernels will compile on first use: {e}")
+
+
 # Try to use V3 API if available, fall back to V1 otherwise
 try:
     from comfy_api.latest import io, ComfyExtension
@@ -64,6 +75,7 @@ try:
 
     async def comfy_entrypoint() -> PurzExtension:
         """V3 entry point for the extension system."""
+        _start_kernel_warm_up()
         return PurzExtension()
 
     # Don't export NODE_CLASS_MAPPINGS when V3 is available
@@ -73,5 +85,6 @@ try:
 except ImportError:
     # V3 API not available - fall back to V1
     from .nodes import NODE_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS
+    _start_kernel_warm_up()
 
     __all__ = ["NODE_CLASS_MAPPINGS", "NODE_DISPLAY_NAME_MAPPINGS", "WEB_DIRECTORY"]
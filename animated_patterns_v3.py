@@ -9,16 +9,12 @@ import math
 
 from comfy_api.latest import io
 
+from .utils import hex_to_rgb
+
 # Use slider display for numeric inputs
 SLIDER = io.NumberDisplay.slider
 
 
-def hex_to_rgb(hex_color: str) -> tuple:
-    """Convert hex color string to RGB tuple."""
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-
-
 class TextureMath:
     """Mathematical operations for combining textures, like Blender's Math node."""
 
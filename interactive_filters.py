@@ -13,12 +13,28 @@ import base64
 import io
 import os
 import json
+import math
+import functools
 import time
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageFilter
+import cv2
 
 import folder_paths
-from .utils import rgb_to_hsv_vectorized, hsv_to_rgb_vectorized
+from .utils import rgb_to_hsv_vectorized, hsv_to_rgb_vectorized, HAS_NUMBA, njit
+
+# ModernGL is optional: when available, filter stacks can run the frontend's GLSL
+# on the GPU. Shader output is close to, but not identical with, the NumPy
+# reference, so the GPU path is opt-in via PURZ_GPU_FILTERS=1
+try:
+    import moderngl
+    HAS_MODERNGL = True
+except ImportError:
+    HAS_MODERNGL = False
+
+USE_GPU_FILTERS = HAS_MODERNGL and os.environ.get("PURZ_GPU_FILTERS", "").lower() in ("1", "true", "yes")
 
 # Try to import ComfyUI server components for real-time messaging
 try:
@@ -35,16 +51,29 @@ PURZ_RENDERED_IMAGES = {}  # WebGL-rendered frames (list of base64 PNGs) for bat
 PURZ_BATCH_PENDING = {}  # Signals that backend is waiting for batch processing (node_id -> batch_size)
 PURZ_BATCH_READY = {}  # Signals that frontend finished processing (node_id -> True)
 PURZ_BATCH_ID = {}  # Unique ID per execution to prevent stale frame mixing (node_id -> batch_id)
+PURZ_BATCH_EVENTS = {}  # Wakes the waiting execution when the final chunk arrives (node_id -> threading.Event)
 
 
 # =============================================================================
 # SERVER-SIDE FILTER IMPLEMENTATIONS
 # =============================================================================
 # Each filter is a standalone function that takes (result, params, original) and
-# returns the modified result. The FILTER_REGISTRY maps effect names to handlers.
+# returns the modified result without writing to its inputs (copy first if
+# needed). The FILTER_REGISTRY maps effect names to handlers.
 
 # Luminance coefficients (ITU-R BT.601)
-LUMA_COEFFS = np.array([0.299, 0.587, 0.114])
+LUMA_COEFFS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+# Classic sepia tone matrix (rows produce R, G, B)
+SEPIA_MATRIX = np.array([
+    [0.393, 0.769, 0.189],
+    [0.349, 0.686, 0.168],
+    [0.272, 0.534, 0.131],
+], dtype=np.float32)
+
+
+# Shared generator for film grain (float32 output, no float64 temporaries)
+_GRAIN_RNG = np.random.default_rng()
 
 
 def _compute_luminance(img):
@@ -52,10 +81,115 @@ def _compute_luminance(img):
     return np.dot(img[..., :3], LUMA_COEFFS)
 
 
-def _to_grayscale_rgb(img):
-    """Convert image to grayscale but keep 3 channels."""
-    gray = _compute_luminance(img)
-    return np.stack([gray] * 3, axis=-1)
+def _readonly(arr):
+    """Freeze a cached array so no caller can modify the shared copy."""
+    arr.flags.writeable = False
+    return arr
+
+
+@functools.lru_cache(maxsize=256)
+def _saturation_matrix(scale):
+    """Color matrix that scales each pixel's distance from its luminance by `scale`."""
+    return _readonly((scale * np.eye(3) + (1.0 - scale) * np.outer(np.ones(3), LUMA_COEFFS)).astype(np.float32))
+
+
+def _apply_color_matrix(img, matrix, offset=0.0):
+    """Apply a 3x3 color matrix (plus optional offset) to every pixel with a single matmul."""
+    flat = img.reshape(-1, 3) @ matrix.T
+    if np.any(offset):
+        flat += offset
+    return flat.reshape(img.shape)
+
+
+def _gaussian_blur(img, sigma):
+    """Gaussian blur a float32 image directly (no uint8/PIL round-trip)."""
+    if sigma <= 0:
+        return img
+    return cv2.GaussianBlur(img, (0, 0), sigma, borderType=cv2.BORDER_REPLICATE)
+
+
+# =============================================================================
+# FUSED PIXEL KERNELS (optional Numba)
+# =============================================================================
+# Per-pixel tone curves walk the image once and do all their math per pixel
+# instead of allocating several full-frame NumPy temporaries. Kernels run
+# serially with nogil; the strip tiling below provides the parallelism.
+
+def _can_fuse(img):
+    """True if the Numba kernels can handle this image."""
+    return HAS_NUMBA and img.ndim == 3 and img.shape[-1] == 3
+
+
+def _run_pixel_kernel(kernel, img, *args):
+    """Run a fused kernel over an (H, W, 3) image viewed as (N, 3) pixels."""
+    px = np.ascontiguousarray(img, dtype=np.float32).reshape(-1, 3)
+    return kernel(px, *args).reshape(img.shape)
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _clip01(v):
+    return min(max(v, 0.0), 1.0)
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _affine_kernel(px, scale, offset):
+    out = np.empty_like(px)
+    for i in range(px.shape[0]):
+        for c in range(3):
+            out[i, c] = _clip01(px[i, c] * scale + offset)
+    return out
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _vibrance_kernel(px, amount):
+    out = np.empty_like(px)
+    for i in range(px.shape[0]):
+        r, g, b = px[i, 0], px[i, 1], px[i, 2]
+        k = 1.0 + amount * (1.0 - (max(r, g, b) - min(r, g, b)))
+        lum = r * 0.299 + g * 0.587 + b * 0.114
+        out[i, 0] = _clip01(lum + (r - lum) * k)
+        out[i, 1] = _clip01(lum + (g - lum) * k)
+        out[i, 2] = _clip01(lum + (b - lum) * k)
+    return out
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _tone_mask_kernel(px, amount, scale, bias):
+    # Adds amount * clip(lum * scale + bias) to every channel
+    out = np.empty_like(px)
+    for i in range(px.shape[0]):
+        r, g, b = px[i, 0], px[i, 1], px[i, 2]
+        lum = r * 0.299 + g * 0.587 + b * 0.114
+        shift = amount * _clip01(lum * scale + bias)
+        out[i, 0] = _clip01(r + shift)
+        out[i, 1] = _clip01(g + shift)
+        out[i, 2] = _clip01(b + shift)
+    return out
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _curves_kernel(px, shadows, mids, highs):
+    out = np.empty_like(px)
+    for i in range(px.shape[0]):
+        for ch in range(3):
+            c = px[i, ch]
+            c = c + shadows * (1 - c) * (1 - c) * c
+            c = c + mids * c * (1 - c)
+            c = c + highs * c * c * (1 - c)
+            out[i, ch] = _clip01(c)
+    return out
+
+
+def warm_up_kernels():
+    """Compile the fused kernels on a single pixel (see utils.warm_up_in_background)."""
+    if not HAS_NUMBA:
+        return
+    px = np.zeros((1, 3), dtype=np.float32)
+    _affine_kernel(px, 1.0, 0.0)
+    _vibrance_kernel(px, 0.0)
+    _tone_mask_kernel(px, 0.0, 1.0, 0.0)
+    _curves_kernel(px, 0.0, 0.0, 0.0)
+    hsv_to_rgb_vectorized(rgb_to_hsv_vectorized(px), out=px)
 
 
 # =============================================================================
@@ -64,25 +198,30 @@ def _to_grayscale_rgb(img):
 
 def _filter_desaturate(result, params, original):
     amount = params.get("amount", 1.0)
-    gray = _to_grayscale_rgb(result)
-    return result * (1 - amount) + gray * amount
+    return _apply_color_matrix(result, _saturation_matrix(1.0 - amount))
 
 
 def _filter_brightness(result, params, original):
     amount = params.get("amount", 0.0)
+    if _can_fuse(result):
+        return _run_pixel_kernel(_affine_kernel, result, 1.0, amount)
     return np.clip(result + amount, 0, 1)
 
 
 def _filter_contrast(result, params, original):
     amount = params.get("amount", 0.0)
+    if _can_fuse(result):
+        return _run_pixel_kernel(_affine_kernel, result, 1.0 + amount, -0.5 * amount)
     result = (result - 0.5) * (1.0 + amount) + 0.5
-    return np.clip(result, 0, 1)
+    return np.clip(result, 0, 1, out=result)
 
 
 def _filter_exposure(result, params, original):
     amount = params.get("amount", 0.0)
+    if _can_fuse(result):
+        return _run_pixel_kernel(_affine_kernel, result, 2.0 ** amount, 0.0)
     result = result * (2.0 ** amount)
-    return np.clip(result, 0, 1)
+    return np.clip(result, 0, 1, out=result)
 
 
 def _filter_gamma(result, params, original):
@@ -93,20 +232,21 @@ def _filter_gamma(result, params, original):
 
 def _filter_vibrance(result, params, original):
     amount = params.get("amount", 0.0)
+    if _can_fuse(result):
+        return _run_pixel_kernel(_vibrance_kernel, result, amount)
     max_c = np.max(result, axis=-1)
     min_c = np.min(result, axis=-1)
     sat = max_c - min_c
     amt = amount * (1.0 - sat)
-    gray = _to_grayscale_rgb(result)
+    gray = _compute_luminance(result)[..., np.newaxis]
     result = gray + (result - gray) * (1.0 + amt[..., np.newaxis])
-    return np.clip(result, 0, 1)
+    return np.clip(result, 0, 1, out=result)
 
 
 def _filter_saturation(result, params, original):
     amount = params.get("amount", 0.0)
-    gray = _to_grayscale_rgb(result)
-    result = gray + (result - gray) * (1.0 + amount)
-    return np.clip(result, 0, 1)
+    result = _apply_color_matrix(result, _saturation_matrix(1.0 + amount))
+    return np.clip(result, 0, 1, out=result)
 
 
 # =============================================================================
@@ -117,9 +257,7 @@ def _filter_hueShift(result, params, original):
     amount = params.get("amount", 0.0)
     hsv = rgb_to_hsv_vectorized(result[..., :3])
     hsv[..., 0] = (hsv[..., 0] + amount) % 1.0
-    result = result.copy()
-    result[..., :3] = hsv_to_rgb_vectorized(hsv)
-    return result
+    return hsv_to_rgb_vectorized(hsv, out=hsv)
 
 
 def _filter_temperature(result, params, original):
@@ -143,22 +281,20 @@ def _filter_colorize(result, params, original):
     hue = params.get("hue", 0.0)
     sat = params.get("saturation", 0.5)
     lum = _compute_luminance(result)
-    hsv = np.stack([
-        np.full_like(lum, hue),
-        np.full_like(lum, sat),
-        lum
-    ], axis=-1)
-    result = result.copy()
-    result[..., :3] = hsv_to_rgb_vectorized(hsv)
-    return result
+    hsv = np.empty(lum.shape + (3,), dtype=lum.dtype)
+    hsv[..., 0] = hue
+    hsv[..., 1] = sat
+    hsv[..., 2] = lum
+    return hsv_to_rgb_vectorized(hsv, out=hsv)
 
 
 def _filter_channelMixer(result, params, original):
-    result = result.copy()
-    result[..., 0] = np.clip(result[..., 0] + params.get("redShift", 0), 0, 1)
-    result[..., 1] = np.clip(result[..., 1] + params.get("greenShift", 0), 0, 1)
-    result[..., 2] = np.clip(result[..., 2] + params.get("blueShift", 0), 0, 1)
-    return result
+    shifts = np.array([
+        params.get("redShift", 0),
+        params.get("greenShift", 0),
+        params.get("blueShift", 0),
+    ], dtype=np.float32)
+    return np.clip(result + shifts, 0, 1)
 
 
 # =============================================================================
@@ -167,34 +303,42 @@ def _filter_channelMixer(result, params, original):
 
 def _filter_highlights(result, params, original):
     amount = params.get("amount", 0.0)
+    if _can_fuse(result):
+        return _run_pixel_kernel(_tone_mask_kernel, result, amount, 2.0, -1.0)
     lum = _compute_luminance(result)
     mask = np.clip((lum - 0.5) * 2, 0, 1)
     result = result + amount * mask[..., np.newaxis]
-    return np.clip(result, 0, 1)
+    return np.clip(result, 0, 1, out=result)
 
 
 def _filter_shadows(result, params, original):
     amount = params.get("amount", 0.0)
+    if _can_fuse(result):
+        return _run_pixel_kernel(_tone_mask_kernel, result, amount, -2.0, 1.0)
     lum = _compute_luminance(result)
     mask = np.clip(1 - lum * 2, 0, 1)
     result = result + amount * mask[..., np.newaxis]
-    return np.clip(result, 0, 1)
+    return np.clip(result, 0, 1, out=result)
 
 
 def _filter_whites(result, params, original):
     amount = params.get("amount", 0.0)
+    if _can_fuse(result):
+        return _run_pixel_kernel(_tone_mask_kernel, result, amount, 1.0 / 0.3, -0.7 / 0.3)
     lum = _compute_luminance(result)
     mask = np.clip((lum - 0.7) / 0.3, 0, 1)
     result = result + amount * mask[..., np.newaxis]
-    return np.clip(result, 0, 1)
+    return np.clip(result, 0, 1, out=result)
 
 
 def _filter_blacks(result, params, original):
     amount = params.get("amount", 0.0)
+    if _can_fuse(result):
+        return _run_pixel_kernel(_tone_mask_kernel, result, amount, -1.0 / 0.3, 1.0)
     lum = _compute_luminance(result)
     mask = np.clip(1 - lum / 0.3, 0, 1)
     result = result + amount * mask[..., np.newaxis]
-    return np.clip(result, 0, 1)
+    return np.clip(result, 0, 1, out=result)
 
 
 def _filter_levels(result, params, original):
@@ -202,7 +346,7 @@ def _filter_levels(result, params, original):
     white = params.get("whitePoint", 1.0)
     mid = params.get("midtones", 1.0)
     result = (result - black) / max(white - black, 0.001)
-    result = np.clip(result, 0, 1)
+    np.clip(result, 0, 1, out=result)
     return np.power(result, 1.0 / max(mid, 0.01))
 
 
@@ -210,11 +354,13 @@ def _filter_curves(result, params, original):
     shadows = params.get("shadows", 0.0)
     mids = params.get("midtones", 0.0)
     highs = params.get("highlights", 0.0)
+    if _can_fuse(result):
+        return _run_pixel_kernel(_curves_kernel, result, shadows, mids, highs)
     c = result
     c = c + shadows * (1 - c) * (1 - c) * c
     c = c + mids * c * (1 - c)
     c = c + highs * c * c * (1 - c)
-    return np.clip(c, 0, 1)
+    return np.clip(c, 0, 1, out=c)
 
 
 # =============================================================================
@@ -223,22 +369,15 @@ def _filter_curves(result, params, original):
 
 def _filter_blur(result, params, original):
     amount = params.get("amount", 5.0)
-    if amount > 0:
-        img_pil = Image.fromarray((result * 255).astype(np.uint8))
-        img_pil = img_pil.filter(ImageFilter.GaussianBlur(radius=amount))
-        return np.array(img_pil).astype(np.float32) / 255.0
-    return result
+    return _gaussian_blur(result, amount)
 
 
 def _filter_sharpen(result, params, original):
     amount = params.get("amount", 0.5)
     if amount > 0:
-        img_pil = Image.fromarray((result * 255).astype(np.uint8))
-        blurred = img_pil.filter(ImageFilter.GaussianBlur(radius=1))
-        img_np_blur = np.array(blurred).astype(np.float32) / 255.0
-        diff = result - img_np_blur
+        diff = result - _gaussian_blur(result, 1)
         result = result + diff * amount
-        return np.clip(result, 0, 1)
+        return np.clip(result, 0, 1, out=result)
     return result
 
 
@@ -246,36 +385,41 @@ def _filter_unsharpMask(result, params, original):
     amount = params.get("amount", 1.0)
     threshold = params.get("threshold", 0.1)
     if amount > 0:
-        img_pil = Image.fromarray((result * 255).astype(np.uint8))
-        blurred = img_pil.filter(ImageFilter.GaussianBlur(radius=2))
-        blur_np = np.array(blurred).astype(np.float32) / 255.0
-        diff = result - blur_np
+        diff = result - _gaussian_blur(result, 2)
         mask = (np.abs(diff).sum(axis=-1) > threshold).astype(np.float32)
         result = result + diff * amount * mask[..., np.newaxis]
-        return np.clip(result, 0, 1)
+        return np.clip(result, 0, 1, out=result)
     return result
 
 
 def _filter_clarity(result, params, original):
     amount = params.get("amount", 0.0)
     if amount != 0:
-        img_pil = Image.fromarray((result * 255).astype(np.uint8))
-        blurred = img_pil.filter(ImageFilter.GaussianBlur(radius=2))
-        blur_np = np.array(blurred).astype(np.float32) / 255.0
-        high_pass = result - blur_np
+        high_pass = result - _gaussian_blur(result, 2)
         lum = _compute_luminance(result)
         mid_mask = 1 - np.abs(lum - 0.5) * 2
         result = result + high_pass * amount * mid_mask[..., np.newaxis]
-        return np.clip(result, 0, 1)
+        return np.clip(result, 0, 1, out=result)
     return result
 
 
+@functools.lru_cache(maxsize=256)
+def _dehaze_transform(amount):
+    """
+    Contrast boost followed by a saturation boost around the original
+    luminance, folded into one affine color transform.
+    """
+    contrast = 1.0 + amount * 0.5
+    saturation = 1.0 + amount * 0.3
+    matrix = saturation * contrast * np.eye(3) + (1.0 - saturation) * np.outer(np.ones(3), LUMA_COEFFS)
+    offset = saturation * 0.5 * (1.0 - contrast)
+    return _readonly(matrix.astype(np.float32)), offset
+
+
 def _filter_dehaze(result, params, original):
-    amount = params.get("amount", 0.0)
-    gray = _to_grayscale_rgb(result)
-    result = (result - 0.5) * (1.0 + amount * 0.5) + 0.5
-    result = gray + (result - gray) * (1.0 + amount * 0.3)
-    return np.clip(result, 0, 1)
+    matrix, offset = _dehaze_transform(params.get("amount", 0.0))
+    result = _apply_color_matrix(result, matrix, offset)
+    return np.clip(result, 0, 1, out=result)
 
 
 # =============================================================================
@@ -295,21 +439,25 @@ def _filter_vignette(result, params, original):
 
 def _filter_grain(result, params, original):
     amount = params.get("amount", 0.1)
-    noise = (np.random.random(result.shape) * 2 - 1) * amount
-    return np.clip(result + noise, 0, 1)
+    # Uniform noise in [-amount, amount), generated and combined in one float32 buffer
+    noise = _GRAIN_RNG.random(result.shape, dtype=np.float32)
+    noise *= 2 * amount
+    noise -= amount
+    noise += result
+    return np.clip(noise, 0, 1, out=noise)
 
 
 def _filter_posterize(result, params, original):
     levels = int(params.get("levels", 8))
     result = np.floor(result * levels) / (levels - 1)
-    return np.clip(result, 0, 1)
+    return np.clip(result, 0, 1, out=result)
 
 
 def _filter_threshold(result, params, original):
     thresh = params.get("threshold", 0.5)
     gray = _compute_luminance(result)
     binary = (gray > thresh).astype(np.float32)
-    return np.stack([binary] * 3, axis=-1)
+    return np.broadcast_to(binary[..., np.newaxis], result.shape)
 
 
 def _filter_invert(result, params, original):
@@ -320,11 +468,7 @@ def _filter_invert(result, params, original):
 
 def _filter_sepia(result, params, original):
     amount = params.get("amount", 1.0)
-    sepia_r = result[..., 0] * 0.393 + result[..., 1] * 0.769 + result[..., 2] * 0.189
-    sepia_g = result[..., 0] * 0.349 + result[..., 1] * 0.686 + result[..., 2] * 0.168
-    sepia_b = result[..., 0] * 0.272 + result[..., 1] * 0.534 + result[..., 2] * 0.131
-    sepia = np.stack([sepia_r, sepia_g, sepia_b], axis=-1)
-    sepia = np.clip(sepia, 0, 1)
+    sepia = np.clip(_apply_color_matrix(result, SEPIA_MATRIX), 0, 1)
     return result * (1 - amount) + sepia * amount
 
 
@@ -350,7 +494,7 @@ def _filter_edgeDetect(result, params, original):
     img_pil = Image.fromarray((result * 255).astype(np.uint8))
     edges = img_pil.filter(ImageFilter.FIND_EDGES)
     edge_np = np.array(edges).astype(np.float32) / 255.0 * amount
-    return np.clip(edge_np, 0, 1)
+    return np.clip(edge_np, 0, 1, out=edge_np)
 
 
 def _filter_sketch(result, params, original):
@@ -360,15 +504,13 @@ def _filter_sketch(result, params, original):
     edge_np = np.array(edges).astype(np.float32) / 255.0
     gray_edges = _compute_luminance(edge_np)
     sketch = 1 - np.clip(gray_edges * amount, 0, 1)
-    return np.stack([sketch] * 3, axis=-1)
+    return np.broadcast_to(sketch[..., np.newaxis], result.shape)
 
 
 def _filter_oilPaint(result, params, original):
     levels = int(params.get("levels", 12))
     radius = params.get("radius", 2.0)
-    img_pil = Image.fromarray((result * 255).astype(np.uint8))
-    img_pil = img_pil.filter(ImageFilter.GaussianBlur(radius=radius))
-    result = np.array(img_pil).astype(np.float32) / 255.0
+    result = _gaussian_blur(result, radius)
     return np.floor(result * levels) / max(levels - 1, 1)
 
 
@@ -379,10 +521,8 @@ def _filter_oilPaint(result, params, original):
 def _filter_pixelate(result, params, original):
     size = int(max(1, params.get("size", 8)))
     h, w, c = result.shape
-    small = Image.fromarray((result * 255).astype(np.uint8)).resize(
-        (max(1, w // size), max(1, h // size)), Image.NEAREST
-    )
-    return np.array(small.resize((w, h), Image.NEAREST)).astype(np.float32) / 255.0
+    small = cv2.resize(result, (max(1, w // size), max(1, h // size)), interpolation=cv2.INTER_NEAREST_EXACT)
+    return cv2.resize(small, (w, h), interpolation=cv2.INTER_NEAREST_EXACT)
 
 
 def _filter_chromatic(result, params, original):
@@ -437,7 +577,7 @@ def _filter_halftone(result, params, original):
                     for dx in range(min(size, w - x)):
                         if (dy - cy) ** 2 + (dx - cx) ** 2 <= radius ** 2:
                             halftone[y + dy, x + dx] = 1.0
-    return np.stack([halftone] * 3, axis=-1)
+    return np.broadcast_to(halftone[..., np.newaxis], result.shape)
 
 
 # =============================================================================
@@ -454,11 +594,9 @@ def _filter_lensDistort(result, params, original):
         dy = (y - cy) / cy
         dist = np.sqrt(dx ** 2 + dy ** 2)
         distortion = 1 + dist ** 2 * amount
-        new_x = cx + dx * distortion * cx
-        new_y = cy + dy * distortion * cy
-        new_x = np.clip(new_x.astype(int), 0, w - 1)
-        new_y = np.clip(new_y.astype(int), 0, h - 1)
-        return result[new_y, new_x]
+        new_x = (cx + dx * distortion * cx).astype(np.float32)
+        new_y = (cy + dy * distortion * cy).astype(np.float32)
+        return cv2.remap(result, new_x, new_y, cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
     return result
 
 
@@ -467,18 +605,12 @@ def _filter_tiltShift(result, params, original):
     range_val = params.get("range", 0.2)
     blur_amount = params.get("blur", 8)
     h, w, _ = result.shape
-    y_coords = np.linspace(0, 1, h)
+    y_coords = np.linspace(0, 1, h, dtype=np.float32)
     dist = np.abs(y_coords - focus)
-    blur_mask = np.clip((dist - range_val * 0.5) / range_val, 0, 1)
+    blur_mask = np.clip((dist - range_val * 0.5) / range_val, 0, 1).astype(np.float32)[:, np.newaxis, np.newaxis]
 
-    img_pil = Image.fromarray((result * 255).astype(np.uint8))
-    blurred = img_pil.filter(ImageFilter.GaussianBlur(radius=blur_amount))
-    blur_np = np.array(blurred).astype(np.float32) / 255.0
-
-    result = result.copy()
-    for y in range(h):
-        result[y] = result[y] * (1 - blur_mask[y]) + blur_np[y] * blur_mask[y]
-    return result
+    blur_np = _gaussian_blur(result, blur_amount)
+    return result + (blur_np - result) * blur_mask
 
 
 def _filter_radialBlur(result, params, original):
@@ -486,21 +618,24 @@ def _filter_radialBlur(result, params, original):
     if amount > 0:
         h, w, _ = result.shape
         samples = 10
-        accumulated = np.zeros_like(result)
-        for i in range(samples):
+        # The first sample is the unscaled image; the rest are resized into one
+        # reused scratch buffer and added onto the centered accumulator window.
+        # cv2 only writes into dst when the source dtype matches, so resize float32
+        src = np.asarray(result, dtype=np.float32)
+        accumulated = src.copy()
+        scratch = np.empty(accumulated.size, dtype=np.float32)
+        for i in range(1, samples):
             scale = 1.0 - amount * 0.02 * i
             scaled_w = int(w * scale)
             scaled_h = int(h * scale)
             if scaled_w > 0 and scaled_h > 0:
-                img_pil = Image.fromarray((result * 255).astype(np.uint8))
-                scaled = img_pil.resize((scaled_w, scaled_h), Image.BILINEAR)
+                scaled = scratch[:scaled_h * scaled_w * 3].reshape(scaled_h, scaled_w, 3)
+                cv2.resize(src, (scaled_w, scaled_h), dst=scaled, interpolation=cv2.INTER_LINEAR)
                 offset_x = (w - scaled_w) // 2
                 offset_y = (h - scaled_h) // 2
-                canvas = np.zeros((h, w, 3), dtype=np.float32)
-                scaled_np = np.array(scaled).astype(np.float32) / 255.0
-                canvas[offset_y:offset_y+scaled_h, offset_x:offset_x+scaled_w] = scaled_np
-                accumulated += canvas
-        return accumulated / samples
+                accumulated[offset_y:offset_y+scaled_h, offset_x:offset_x+scaled_w] += scaled
+        accumulated *= 1.0 / samples
+        return accumulated
     return result
 
 
@@ -561,6 +696,51 @@ FILTER_REGISTRY = {
 }
 
 
+# Identity checks: return True when a layer's params leave the image unchanged,
+# so idle layers (e.g. a slider parked at 0) cost nothing
+FILTER_NOOPS = {
+    "desaturate": lambda p: p.get("amount", 1.0) == 0,
+    "brightness": lambda p: p.get("amount", 0.0) == 0,
+    "contrast": lambda p: p.get("amount", 0.0) == 0,
+    "exposure": lambda p: p.get("amount", 0.0) == 0,
+    "gamma": lambda p: p.get("amount", 1.0) == 1,
+    "vibrance": lambda p: p.get("amount", 0.0) == 0,
+    "saturation": lambda p: p.get("amount", 0.0) == 0,
+    "hueShift": lambda p: p.get("amount", 0.0) == 0,
+    "temperature": lambda p: p.get("amount", 0.0) == 0,
+    "tint": lambda p: p.get("amount", 0.0) == 0,
+    "channelMixer": lambda p: not any(p.get(k, 0) for k in ("redShift", "greenShift", "blueShift")),
+    "highlights": lambda p: p.get("amount", 0.0) == 0,
+    "shadows": lambda p: p.get("amount", 0.0) == 0,
+    "whites": lambda p: p.get("amount", 0.0) == 0,
+    "blacks": lambda p: p.get("amount", 0.0) == 0,
+    "levels": lambda p: (p.get("blackPoint", 0.0), p.get("whitePoint", 1.0), p.get("midtones", 1.0)) == (0, 1, 1),
+    "curves": lambda p: not any(p.get(k, 0.0) for k in ("shadows", "midtones", "highlights")),
+    "blur": lambda p: p.get("amount", 5.0) <= 0,
+    "sharpen": lambda p: p.get("amount", 0.5) <= 0,
+    "unsharpMask": lambda p: p.get("amount", 1.0) <= 0,
+    "clarity": lambda p: p.get("amount", 0.0) == 0,
+    "dehaze": lambda p: p.get("amount", 0.0) == 0,
+    "vignette": lambda p: p.get("amount", 0.5) == 0,
+    "grain": lambda p: p.get("amount", 0.1) == 0,
+    "invert": lambda p: p.get("amount", 1.0) == 0,
+    "sepia": lambda p: p.get("amount", 1.0) == 0,
+    "chromatic": lambda p: int(p.get("amount", 2)) <= 0,
+    "glitch": lambda p: p.get("amount", 0.3) == 0,
+    "lensDistort": lambda p: abs(p.get("amount", 0.0)) <= 0.001,
+    "tiltShift": lambda p: p.get("blur", 8) <= 0,
+    "radialBlur": lambda p: p.get("amount", 0.3) <= 0,
+}
+
+
+def _is_noop_layer(effect, params, opacity):
+    """True if applying this layer would return the image unchanged."""
+    if opacity <= 0 or effect not in FILTER_REGISTRY:
+        return True
+    noop = FILTER_NOOPS.get(effect)
+    return noop is not None and noop(params)
+
+
 def apply_filter(img_np, effect, params, opacity):
     """
     Apply a single filter effect to an image.
@@ -574,31 +754,459 @@ def apply_filter(img_np, effect, params, opacity):
     Returns:
         filtered numpy array
     """
-    original = img_np.copy()
-    result = img_np.copy()
+    # Unknown effects, zero opacity and identity params: skip the copies and the blend
+    if _is_noop_layer(effect, params, opacity):
+        return img_np
+
+    # Handlers never write to their inputs, so the image is passed without copies
+    result = FILTER_REGISTRY[effect](img_np, params, img_np)
+
+    # Handlers may return a read-only view (broadcast grayscale) or a new array
+    # of another dtype; otherwise the blend and clip reuse the handler's output
+    owned = (result.dtype == np.float32 and result.flags.writeable
+             and not np.may_share_memory(result, img_np))
+    if opacity < 1:
+        # original * (1 - opacity) + result * opacity
+        result = np.subtract(result, img_np, out=result if owned else None, dtype=np.float32)
+        result *= opacity
+        result += img_np
+    elif not owned:
+        return np.clip(result, 0, 1).astype(np.float32, copy=False)
+    return np.clip(result, 0, 1, out=result)
+
+
+# =============================================================================
+# STRIP TILING
+# =============================================================================
+# Large frames are processed in horizontal strips so that a run of layers works
+# on a cache-sized block instead of streaming the whole frame once per layer.
+
+# Rows per strip (64 rows of a 4K RGB float32 frame is ~3 MB)
+FILTER_STRIP_ROWS = 64
+
+# Effects whose output pixel only depends on pixels in the same row
+ROW_LOCAL_FILTERS = frozenset({
+    "desaturate", "brightness", "contrast", "exposure", "gamma", "vibrance", "saturation",
+    "hueShift", "temperature", "tint", "colorize", "channelMixer",
+    "highlights", "shadows", "whites", "blacks", "levels", "curves",
+    "dehaze", "grain", "posterize", "threshold", "invert", "sepia", "duotone", "chromatic",
+})
+
+
+def _gaussian_halo(sigma):
+    """Rows of context a Gaussian blur of the given sigma reads beyond a strip."""
+    return int(math.ceil(max(sigma, 0) * 4)) + 1
+
+
+# Neighbourhood effects: rows of context needed above/below a strip for an exact result.
+# Effects in neither table (vignette, lensDistort, pixelate, ...) need the whole frame.
+FILTER_HALOS = {
+    "blur": lambda params: _gaussian_halo(params.get("amount", 5.0)),
+    "sharpen": lambda params: _gaussian_halo(1),
+    "unsharpMask": lambda params: _gaussian_halo(2),
+    "clarity": lambda params: _gaussian_halo(2),
+    "emboss": lambda params: 1,
+    "edgeDetect": lambda params: 1,
+    "sketch": lambda params: 1,
+    "oilPaint": lambda params: _gaussian_halo(params.get("radius", 2.0)),
+}
+
+
+def _layer_halo(effect, params):
+    """Return the strip halo for a layer, or None if it must see the whole frame."""
+    if effect in ROW_LOCAL_FILTERS:
+        return 0
+    halo_fn = FILTER_HALOS.get(effect)
+    return halo_fn(params) if halo_fn else None
+
+
+def _apply_layers(img_np, layers):
+    """Apply (effect, params, opacity) layers to a whole image or strip."""
+    for effect, params, opacity in layers:
+        img_np = apply_filter(img_np, effect, params, opacity)
+    return img_np
+
+
+# Shared by every tiled run; worker threads are started on first use
+_STRIP_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="purz-strip")
+
 
-    handler = FILTER_REGISTRY.get(effect)
-    if handler:
-        result = handler(result, params, original)
+def _apply_layers_tiled(img_np, layers, halo):
+    """Apply a run of strip-safe layers strip by strip, in parallel."""
+    h = img_np.shape[0]
+    # Keep the overlap small relative to the strip for wide-radius blurs
+    strip_rows = max(FILTER_STRIP_ROWS, halo * 4)
+    if h <= strip_rows:
+        return _apply_layers(img_np, layers)
 
-    # Apply opacity blend with original
-    result = original * (1 - opacity) + result * opacity
-    return np.clip(result, 0, 1).astype(np.float32)
+    output = np.empty(img_np.shape, dtype=np.float32)
+
+    def process_strip(y0):
+        y1 = min(y0 + strip_rows, h)
+        top = max(y0 - halo, 0)
+        bottom = min(y1 + halo, h)
+        strip = _apply_layers(img_np[top:bottom], layers)
+        output[y0:y1] = strip[y0 - top:y1 - top]
+
+    # NumPy, PIL and OpenCV release the GIL inside their kernels
+    list(_STRIP_POOL.map(process_strip, range(0, h, strip_rows)))
+    return output
+
+
+# =============================================================================
+# STACK PLANS
+# =============================================================================
+# Animations run the same stack on every frame, so the per-layer work that only
+# depends on the layer list (no-op removal, folding, strip grouping) is done
+# once per distinct stack and cached.
+
+def _fold_additive(first, second, default):
+    """Merge two same-sign `amount` layers into one; None if they can't merge."""
+    a, b = first.get("amount", default), second.get("amount", default)
+    if a * b < 0:
+        # Opposite signs: the clip between the layers is not a no-op
+        return None
+    return {"amount": a + b}
+
+
+# Consecutive full-opacity layers of the same effect that compose to one layer
+FILTER_FOLDS = {
+    "brightness": lambda first, second: _fold_additive(first, second, 0.0),
+    "exposure": lambda first, second: _fold_additive(first, second, 0.0),
+}
+
+
+def _stack_key(layers):
+    """Hashable signature of the enabled layers in a stack."""
+    return json.dumps([
+        (layer.get("effect", ""), layer.get("params", {}), layer.get("opacity", 1.0))
+        for layer in layers if layer.get("enabled", True)
+    ], sort_keys=True)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_stack_plan(stack_key):
+    """
+    Turn a stack signature into a tuple of (layers, halo) steps.
+
+    A halo of None means a single whole-frame layer; otherwise the layers are a
+    strip-safe run that needs `halo` rows of context.
+    """
+    layers = []
+    for effect, params, opacity in json.loads(stack_key):
+        if _is_noop_layer(effect, params, opacity):
+            continue
+        if layers and opacity == 1 and layers[-1][0] == effect and layers[-1][2] == 1 and effect in FILTER_FOLDS:
+            merged = FILTER_FOLDS[effect](layers[-1][1], params)
+            if merged is not None:
+                layers[-1] = (effect, merged, 1)
+                continue
+        layers.append((effect, params, opacity))
+
+    plan, run, run_halo = [], [], 0
+    for effect, params, opacity in layers:
+        halo = _layer_halo(effect, params)
+        if halo is None:
+            if run:
+                plan.append((tuple(run), run_halo))
+                run, run_halo = [], 0
+            plan.append((((effect, params, opacity),), None))
+        else:
+            run.append((effect, params, opacity))
+            run_halo += halo
+    if run:
+        plan.append((tuple(run), run_halo))
+    return tuple(plan)
+
+
+# =============================================================================
+# OPTIONAL GPU BACKEND (ModernGL)
+# =============================================================================
+# With moderngl installed and a headless OpenGL 3.3 context available, filter
+# stacks run the same GLSL shaders as the WebGL preview (shaders/effects.json),
+# ping-ponging between two float framebuffers on the GPU. Any failure falls
+# back to the NumPy implementations above.
+
+GPU_VERTEX_SHADER = """
+#version 330
+in vec2 a_position;
+in vec2 a_texCoord;
+out vec2 v_texCoord;
+
+void main() {
+    gl_Position = vec4(a_position, 0.0, 1.0);
+    v_texCoord = a_texCoord;
+}
+"""
+
+# Lets the WebGL 1 (GLSL ES 1.00) fragment shaders compile as GLSL 3.30
+# (`output` is a reserved word there, so it is renamed)
+GPU_FRAGMENT_PRELUDE = """#version 330
+#define varying in
+#define texture2D texture
+#define output purz_output
+out vec4 purz_FragColor;
+#define gl_FragColor purz_FragColor
+"""
+
+# Full-screen quad as interleaved (x, y, u, v), matching the frontend geometry
+GPU_QUAD = np.array([
+    -1, -1, 0, 0,   1, -1, 1, 0,   -1, 1, 0, 1,
+    -1,  1, 0, 1,   1, -1, 1, 0,    1, 1, 1, 1,
+], dtype=np.float32)
+
+
+class GPUFilterBackend:
+    """Offscreen OpenGL context that renders filter stacks with the frontend's shaders."""
+
+    def __init__(self):
+        try:
+            self.ctx = moderngl.create_standalone_context(require=330, backend="egl")
+        except Exception:
+            self.ctx = moderngl.create_standalone_context(require=330)
+        shaders_dir = os.path.join(os.path.dirname(__file__), "shaders")
+        with open(os.path.join(shaders_dir, "effects.json"), "r", encoding="utf-8") as f:
+            self.effects = json.load(f)["effects"]
+        self.shaders_dir = shaders_dir
+        self.quad = self.ctx.buffer(GPU_QUAD.tobytes())
+        self.programs = {}
+        # A GL context must only be used by one thread at a time
+        self.lock = threading.Lock()
+
+    def supports(self, layers):
+        return all(effect in self.effects for effect, _, _ in layers)
+
+    def _program(self, effect):
+        """Compile (once) the program and quad VAO for an effect."""
+        if effect not in self.programs:
+            path = os.path.join(self.shaders_dir, self.effects[effect]["shader"])
+            with open(path, "r", encoding="utf-8") as f:
+                fragment = GPU_FRAGMENT_PRELUDE + f.read()
+            program = self.ctx.program(vertex_shader=GPU_VERTEX_SHADER, fragment_shader=fragment)
+            vao = self.ctx.vertex_array(program, [(self.quad, "2f 2f", "a_position", "a_texCoord")])
+            self.programs[effect] = (program, vao)
+        return self.programs[effect]
+
+    def _texture(self, size, data=None):
+        texture = self.ctx.texture(size, 4, data, dtype="f4")
+        texture.filter = (moderngl.LINEAR, moderngl.LINEAR)
+        texture.repeat_x = texture.repeat_y = False
+        return texture
+
+    def apply(self, img_np, layers):
+        """Render (effect, params, opacity) layers over an (H, W, 3) float32 image."""
+        h, w = img_np.shape[:2]
+        # Flip rows so texture coordinates match the frontend's UNPACK_FLIP_Y upload
+        rgba = np.ones((h, w, 4), dtype=np.float32)
+        rgba[..., :3] = img_np[::-1, :, :3]
+
+        with self.lock:
+            source = self._texture((w, h), rgba.tobytes())
+            targets = [self._texture((w, h)) for _ in range(2)]
+            fbos = [self.ctx.framebuffer(color_attachments=[t]) for t in targets]
+            try:
+                texture = source
+                for i, (effect, params, opacity) in enumerate(layers):
+                    program, vao = self._program(effect)
+                    uniforms = {"u_image": 0, "u_opacity": opacity, "u_resolution": (w, h),
+                                "u_seed": params.get("seed", 0)}
+                    for param in self.effects[effect]["params"]:
+                        uniforms[f"u_{param['name']}"] = params.get(param["name"], param["default"])
+                    for name, value in uniforms.items():
+                        if name in program:
+                            program[name].value = value
+
+                    fbos[i % 2].use()
+                    texture.use(location=0)
+                    vao.render(moderngl.TRIANGLES)
+                    texture = targets[i % 2]
+
+                data = fbos[(len(layers) - 1) % 2].read(components=3, dtype="f4")
+            finally:
+                for obj in fbos + targets + [source]:
+                    obj.release()
+
+        result = np.frombuffer(data, dtype=np.float32).reshape(h, w, 3)[::-1]
+        return np.clip(result, 0, 1)
+
+
+_GPU_BACKEND = None
+_GPU_BACKEND_FAILED = False
+_GPU_BACKEND_LOCK = threading.Lock()
+
+
+def _get_gpu_backend():
+    """Return the shared GPU backend, or None if ModernGL/OpenGL is unavailable."""
+    global _GPU_BACKEND, _GPU_BACKEND_FAILED
+    if not HAS_MODERNGL or _GPU_BACKEND_FAILED:
+        return None
+    if _GPU_BACKEND is None:
+        # Concurrent filter stacks must not each create a GL context
+        with _GPU_BACKEND_LOCK:
+            if _GPU_BACKEND is None and not _GPU_BACKEND_FAILED:
+                try:
+                    _GPU_BACKEND = GPUFilterBackend()
+                except Exception as e:
+                    _GPU_BACKEND_FAILED = True
+                    print(f"[Purz Interactive] GPU filter backend unavailable, using CPU: {e}")
+    return _GPU_BACKEND
 
 
 def apply_filter_stack(img_np, layers):
-    """Apply a stack of filter layers to an image."""
+    """
+    Apply a stack of filter layers to an image.
+
+    Consecutive layers that only need a few rows of context are evaluated
+    together on horizontal strips; whole-frame effects run on the full image.
+    The plan for each distinct stack is built once and reused across frames.
+    With PURZ_GPU_FILTERS=1 and ModernGL available the frontend's shaders are used.
+    """
+    gpu = _get_gpu_backend() if USE_GPU_FILTERS else None
+    if gpu is not None:
+        gpu_layers = [
+            (layer.get("effect", ""), layer.get("params", {}), layer.get("opacity", 1.0))
+            for layer in layers if layer.get("enabled", True) and layer.get("opacity", 1.0) > 0
+        ]
+        if gpu_layers and gpu.supports(gpu_layers):
+            try:
+                return gpu.apply(img_np, gpu_layers)
+            except Exception as e:
+                print(f"[Purz Interactive] GPU filter stack failed, using CPU: {e}")
+
     result = img_np.copy()
-    for layer in layers:
-        if not layer.get("enabled", True):
+    for run, halo in _compile_stack_plan(_stack_key(layers)):
+        if halo is None:
+            result = _apply_layers(result, run)
+        else:
+            result = _apply_layers_tiled(result, run, halo)
+    return result
+
+
+# =============================================================================
+# UINT8 STACKS
+# =============================================================================
+# Frames that end up as 8-bit PNGs can be filtered in uint8. A run of effects
+# whose output channel only depends on the same input channel is evaluated once
+# on a 0-255 ramp and applied to the frame as a single lookup table.
+
+PER_CHANNEL_FILTERS = frozenset({
+    "brightness", "contrast", "exposure", "gamma", "temperature", "tint", "channelMixer",
+    "levels", "curves", "posterize", "invert",
+})
+
+
+def _float_to_u8(img):
+    """Round a float32 0-1 image to uint8."""
+    return np.rint(np.clip(img, 0, 1) * 255).astype(np.uint8)
+
+
+def _channel_lut(layers):
+    """Evaluate a run of per-channel layers on a ramp, giving a (256, 1, 3) uint8 LUT for cv2.LUT."""
+    ramp = np.repeat(np.arange(256, dtype=np.float32) / 255.0, 3).reshape(256, 1, 3)
+    return _float_to_u8(_apply_layers(ramp, layers))
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_stack_plan_u8(stack_key):
+    """
+    Turn a stack signature into a tuple of ("lut", lut) and ("float", layers)
+    steps for apply_filter_stack_u8().
+    """
+    steps, run, run_is_lut = [], [], None
+    for effect, params, opacity in json.loads(stack_key):
+        if _is_noop_layer(effect, params, opacity):
             continue
-        effect = layer.get("effect", "")
-        params = layer.get("params", {})
-        opacity = layer.get("opacity", 1.0)
-        result = apply_filter(result, effect, params, opacity)
+        is_lut = effect in PER_CHANNEL_FILTERS
+        if run and is_lut != run_is_lut:
+            steps.append(("lut", _channel_lut(run)) if run_is_lut else ("float", tuple(run)))
+            run = []
+        run.append((effect, params, opacity))
+        run_is_lut = is_lut
+    if run:
+        steps.append(("lut", _channel_lut(run)) if run_is_lut else ("float", tuple(run)))
+    return tuple(steps)
+
+
+def apply_filter_stack_u8(img_u8, layers):
+    """
+    Apply a stack of filter layers to a uint8 (H, W, 3) image.
+
+    Runs of per-channel layers (PER_CHANNEL_FILTERS) collapse into one cv2.LUT
+    lookup; other layers go through the float32 apply_filter_stack() path.
+    """
+    if USE_GPU_FILTERS and _get_gpu_backend() is not None:
+        # Keep the whole stack on the shaders so output matches the preview
+        return _float_to_u8(apply_filter_stack(img_u8.astype(np.float32) * (1.0 / 255.0), layers))
+
+    result = img_u8.copy()
+    for kind, step in _compile_stack_plan_u8(_stack_key(layers)):
+        if kind == "lut":
+            result = cv2.LUT(result, step)
+        else:
+            stack = [{"effect": effect, "params": params, "opacity": opacity} for effect, params, opacity in step]
+            result = _float_to_u8(apply_filter_stack(result.astype(np.float32) * (1.0 / 255.0), stack))
     return result
 
 
+def _decode_rendered_frame(rendered_b64):
+    """Decode one base64 data-URL frame from the frontend to a uint8 RGB array."""
+    if "," in rendered_b64:
+        rendered_b64 = rendered_b64.split(",")[1]
+    image_bytes = base64.b64decode(rendered_b64)
+    return np.asarray(Image.open(io.BytesIO(image_bytes)).convert("RGB"))
+
+
+def _decode_rendered_frames(rendered_frames):
+    """
+    Decode a list of base64 frames into a ComfyUI image batch.
+
+    Frames are decoded in a thread pool (PIL releases the GIL) straight into a
+    preallocated uint8 tensor, which is converted to float32 0-1 in one pass.
+
+    Returns:
+        PyTorch tensor [batch, H, W, 3] float32 0-1
+    """
+    first = _decode_rendered_frame(rendered_frames[0])
+    out_u8 = torch.empty((len(rendered_frames),) + first.shape, dtype=torch.uint8)
+    # Copy through a NumPy view: the decoded arrays are read-only, which
+    # torch.from_numpy warns about
+    out_np = out_u8.numpy()
+    out_np[0] = first
+
+    def decode(i):
+        out_np[i] = _decode_rendered_frame(rendered_frames[i])
+
+    if len(rendered_frames) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(rendered_frames) - 1, os.cpu_count() or 1)) as pool:
+            list(pool.map(decode, range(1, len(rendered_frames))))
+
+    return out_u8.float().div_(255.0)
+
+
+def _apply_stored_layers(images_u8, node_id):
+    """
+    Apply the node's last synced layer stack on the CPU.
+
+    Used when the frontend can't deliver rendered frames (tab closed, timeout,
+    bad upload) so the node still outputs the filtered batch. Works on the same
+    uint8 frames the frontend receives, through apply_filter_stack_u8(), so the
+    result is quantized like the 8-bit PNGs the frontend sends back.
+
+    Args:
+        images_u8: NumPy array [batch, H, W, 3] uint8
+        node_id: String node ID
+
+    Returns:
+        PyTorch tensor [batch, H, W, 3] float32 0-1, or None if there is nothing to apply
+    """
+    layers = PURZ_FILTER_LAYERS.get(node_id)
+    if not layers or not _compile_stack_plan(_stack_key(layers)):
+        return None
+    print(f"[Purz Interactive] Applying {len(layers)} synced layer(s) on the CPU")
+    out_u8 = np.stack([apply_filter_stack_u8(frame, layers) for frame in images_u8])
+    return torch.from_numpy(out_u8).float().div_(255.0)
+
+
 def process_interactive_filter(image, node_id, output_dir, output_type, prefix_append, compress_level, mask=None):
     """
     Shared processing logic for the Interactive Image Filter node.
@@ -620,6 +1228,9 @@ def process_interactive_filter(image, node_id, output_dir, output_type, prefix_a
         (output_image_tensor, ui_results_list)
     """
     batch_size = image.shape[0]
+    if batch_size == 0:
+        # Nothing to save or filter (and a thread pool can't have zero workers)
+        return image, []
 
     # Save ALL original images to temp directory for frontend processing
     filename_prefix = "PurzFilter" + prefix_append
@@ -627,20 +1238,22 @@ def process_interactive_filter(image, node_id, output_dir, output_type, prefix_a
         filename_prefix, output_dir, image[0].shape[1], image[0].shape[0]
     )
 
-    results = []
-    for i in range(batch_size):
-        img_np = (image[i].cpu().numpy() * 255).astype(np.uint8)
-        img_pil = Image.fromarray(img_np, mode='RGB')
+    # Convert the whole batch to uint8 in one op; PNG encoding (which releases
+    # the GIL) then runs in parallel across frames
+    images_u8 = (image * 255).to(torch.uint8).cpu().numpy()
 
+    def save_frame(i):
         file = f"{filename}_{counter:05}_{i:05}.png"
         file_path = os.path.join(full_output_folder, file)
-        img_pil.save(file_path, compress_level=compress_level)
-
-        results.append({
+        Image.fromarray(images_u8[i], mode='RGB').save(file_path, format="PNG", compress_level=compress_level)
+        return {
             "filename": file,
             "subfolder": subfolder,
             "type": output_type
-        })
+        }
+
+    with ThreadPoolExecutor(max_workers=min(batch_size, os.cpu_count() or 1)) as pool:
+        results = list(pool.map(save_frame, range(batch_size)))
 
     output_image = image
 
@@ -657,6 +1270,7 @@ def process_interactive_filter(image, node_id, output_dir, output_type, prefix_a
         PURZ_BATCH_PENDING[node_id] = batch_size
         PURZ_BATCH_READY[node_id] = False
         PURZ_RENDERED_IMAGES[node_id] = None  # Will be set to [] for "no filters" or frames list
+        batch_event = PURZ_BATCH_EVENTS[node_id] = threading.Event()
 
         print(f"[Purz Interactive] Signaling frontend to process {batch_size} frame(s)... batch_id={batch_id}")
 
@@ -674,42 +1288,33 @@ def process_interactive_filter(image, node_id, output_dir, output_type, prefix_a
 
         # Wait for frontend to signal completion (with timeout)
         max_wait = 300  # 5 minutes max
-        poll_interval = 0.1  # 100ms
+        log_interval = 10  # Log progress every 10 seconds
         waited = 0
 
-        while not PURZ_BATCH_READY.get(node_id, False) and waited < max_wait:
-            time.sleep(poll_interval)
-            waited += poll_interval
-
-            # Log progress every 10 seconds
-            if waited > 0 and int(waited * 10) % 100 == 0:
-                rendered_count = len(PURZ_RENDERED_IMAGES.get(node_id) or [])
-                print(f"[Purz Interactive] Waiting... ({rendered_count}/{batch_size} frames, {int(waited)}s elapsed)")
+        while waited < max_wait:
+            if batch_event.wait(timeout=min(log_interval, max_wait - waited)):
+                break
+            waited += log_interval
+            rendered_count = len(PURZ_RENDERED_IMAGES.get(node_id) or [])
+            print(f"[Purz Interactive] Waiting... ({rendered_count}/{batch_size} frames, {int(waited)}s elapsed)")
 
         # Check if we got the rendered frames
+        use_stored_layers = True
         if PURZ_BATCH_READY.get(node_id, False):
             rendered_frames = PURZ_RENDERED_IMAGES.get(node_id)
 
             # If rendered_frames is empty list, frontend said no filters - use original
             if rendered_frames is None:
-                print(f"[Purz Interactive] Frontend didn't respond, using original")
+                print(f"[Purz Interactive] Frontend didn't respond")
             elif len(rendered_frames) == 0:
                 print(f"[Purz Interactive] No filters applied, using original batch")
+                use_stored_layers = False
             elif len(rendered_frames) == batch_size:
                 try:
-                    batch_results = []
                     print(f"[Purz Interactive] Decoding {len(rendered_frames)} WebGL-rendered frames")
-
-                    for i, rendered_b64 in enumerate(rendered_frames):
-                        if "," in rendered_b64:
-                            rendered_b64 = rendered_b64.split(",")[1]
-                        image_bytes = base64.b64decode(rendered_b64)
-                        rendered_pil = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-                        rendered_np = np.array(rendered_pil).astype(np.float32) / 255.0
-                        batch_results.append(torch.from_numpy(rendered_np))
-
-                    output_image = torch.stack(batch_results)
+                    output_image = _decode_rendered_frames(rendered_frames)
                     print(f"[Purz Interactive] Batch output ready: {output_image.shape}")
+                    use_stored_layers = False
 
                 except Exception as e:
                     print(f"[Purz Interactive] Failed to decode rendered frames: {e}")
@@ -720,24 +1325,28 @@ def process_interactive_filter(image, node_id, output_dir, output_type, prefix_a
         else:
             print(f"[Purz Interactive] Timeout waiting for frontend processing after {int(waited)}s")
 
+        # Frontend frames unavailable: fall back to the synced layers, else the original
+        if use_stored_layers:
+            try:
+                output_image = _apply_stored_layers(images_u8, node_id)
+            except Exception as e:
+                print(f"[Purz Interactive] CPU filter fallback failed: {e}")
+                output_image = None
+            if output_image is None:
+                print(f"[Purz Interactive] Using original batch")
+                output_image = image
+
         # Clean up
         PURZ_BATCH_PENDING.pop(node_id, None)
         PURZ_BATCH_READY.pop(node_id, None)
         PURZ_RENDERED_IMAGES.pop(node_id, None)
+        PURZ_BATCH_EVENTS.pop(node_id, None)
 
     elif node_id and node_id in PURZ_RENDERED_IMAGES:
         rendered_frames = PURZ_RENDERED_IMAGES[node_id]
         if rendered_frames and len(rendered_frames) > 0:
             try:
-                batch_results = []
-                for rendered_b64 in rendered_frames:
-                    if "," in rendered_b64:
-                        rendered_b64 = rendered_b64.split(",")[1]
-                    image_bytes = base64.b64decode(rendered_b64)
-                    rendered_pil = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-                    rendered_np = np.array(rendered_pil).astype(np.float32) / 255.0
-                    batch_results.append(torch.from_numpy(rendered_np))
-                output_image = torch.stack(batch_results)
+                output_image = _decode_rendered_frames(rendered_frames)
             except Exception as e:
                 print(f"[Purz Interactive] Failed to decode rendered frames: {e}")
 
@@ -916,6 +1525,9 @@ if HAS_SERVER:
             # Signal completion only on final chunk
             if is_final:
                 PURZ_BATCH_READY[node_id] = True
+                batch_event = PURZ_BATCH_EVENTS.get(node_id)
+                if batch_event:
+                    batch_event.set()
                 print(f"[Purz Interactive] All {current_count} frames received for node {node_id}")
 
             return web.json_response({"success": True, "count": current_count, "ready": is_final})
@@ -1,9 +1,386 @@
+import os
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
 import torch
+import torch.nn.functional as F
 import numpy as np
 import math
 from PIL import Image, ImageDraw
 
-from .utils import hex_to_rgb, pil_to_numpy, numpy_to_tensor
+from .utils import hex_to_rgb, numpy_to_tensor, HAS_NUMBA, njit
+
+
+# =============================================================================
+# Vectorized Pattern Renderers
+# =============================================================================
+# Shared by the V1 and V3 nodes. Each renderer builds one image as a NumPy
+# array; the batch is the same image repeated.
+
+def batch_pattern(img_np: np.ndarray, batch_size: int) -> torch.Tensor:
+    """
+    Repeat a single pattern image across a batch.
+
+    Args:
+        img_np: NumPy array [H, W, 3] (uint8 0-255 or float32 0-1)
+        batch_size: Number of images in the output batch
+
+    Returns:
+        PyTorch tensor [batch_size, H, W, 3] float32 in range 0-1
+    """
+    if img_np.dtype == np.float32:
+        # Renderers return freshly allocated arrays, so the tensor can share memory
+        image = torch.from_numpy(np.ascontiguousarray(img_np))
+    else:
+        image = numpy_to_tensor(img_np)
+    return image.unsqueeze(0).expand(batch_size, -1, -1, -1).contiguous()
+
+
+def _color_lut(*colors: tuple) -> np.ndarray:
+    """[N, 3] float32 lookup table of 0-255 RGB colors scaled to 0-1 (same values as uint8 / 255)."""
+    return np.array(colors, dtype=np.float32) / np.float32(255)
+
+
+def _colorize(mask: np.ndarray, rgb_off: tuple, rgb_on: tuple) -> np.ndarray:
+    """Map a boolean [H, W] mask to a float32 [H, W, 3] image with one table gather."""
+    return np.take(_color_lut(rgb_off, rgb_on), np.ascontiguousarray(mask).view(np.uint8), axis=0)
+
+
+def render_checkerboard(width: int, height: int, square_size: int, rgb1: tuple, rgb2: tuple) -> np.ndarray:
+    """Checkerboard as a float32 [H, W, 3] array in 0-1; the top-left square is rgb1."""
+    # Build one 2x2-square tile and repeat it; np.tile is a straight memory copy
+    c1, c2 = _color_lut(rgb1, rgb2)
+    tile = np.array([[c1, c2], [c2, c1]])
+    tile = np.repeat(np.repeat(tile, square_size, axis=0), square_size, axis=1)
+    reps_y = math.ceil(height / tile.shape[0])
+    reps_x = math.ceil(width / tile.shape[1])
+    # Crop the width on the thin row band so the final row crop stays contiguous
+    band = np.tile(tile, (1, reps_x, 1))[:, :width]
+    return np.tile(band, (reps_y, 1, 1))[:height]
+
+
+def _lattice_distance(coords: np.ndarray, first: int, period: int, last: int = None) -> np.ndarray:
+    """
+    Distance from each coordinate to the nearest of first, first + period, ...
+
+    With `last`, centers beyond it are excluded (mirrors `range(first, last + 1, period)`).
+    """
+    offset = coords - first
+    if last is None:
+        d = offset % period
+        d = np.minimum(d, period - d)
+        return np.where(offset < 0, -offset, d)
+    count = (last - first) // period + 1
+    lower = np.clip(offset // period, 0, count - 1)
+    upper = np.minimum(lower + 1, count - 1)
+    return np.minimum(np.abs(offset - lower * period), np.abs(offset - upper * period))
+
+
+@functools.lru_cache(maxsize=64)
+def _ellipse_row_half_widths(radius: int) -> np.ndarray:
+    """
+    Half-width of each row of PIL's filled ellipse() of the given radius, indexed
+    by distance from the center row, with -1 for rows it doesn't reach.
+
+    PIL's coverage is symmetric and its rows narrow away from the center, so a
+    pixel at per-axis distances (dx, dy) from a center is covered exactly when
+    dx <= half_widths[dy].
+    """
+    size = 2 * radius + 1
+    disc = Image.new("1", (size, size), 0)
+    ImageDraw.Draw(disc).ellipse([0, 0, size - 1, size - 1], fill=1)
+    row_counts = np.asarray(disc)[radius:].sum(axis=1)
+    # Trailing -1 so every distance past the edge can be clamped onto it
+    return np.append((row_counts - 1) // 2, -1)
+
+
+def _disc_mask(dx: np.ndarray, dy: np.ndarray, radius: int) -> np.ndarray:
+    """[H, W] mask of the pixels PIL's ellipse() covers, from per-axis distances to the nearest center."""
+    half_widths = _ellipse_row_half_widths(radius)
+    return dx[None, :] <= half_widths[np.minimum(dy, radius + 1)][:, None]
+
+
+def render_polka_dots(width: int, height: int, dot_radius: int, spacing: int, stagger: bool,
+                      bg_rgb: tuple, dot_rgb: tuple) -> np.ndarray:
+    """
+    Polka dots as a float32 [H, W, 3] array in 0-1.
+
+    Dot centers start at spacing // 2 on both axes; with stagger, odd rows are
+    shifted right by spacing // 2. Each row parity is a rectangular lattice, so
+    the nearest dot is found independently per axis.
+    """
+    xs = np.arange(width)
+    ys = np.arange(height)
+    half = spacing // 2
+
+    if stagger:
+        lattices = [(half, half, 2 * spacing), (half + half, half + spacing, 2 * spacing)]
+    else:
+        lattices = [(half, half, spacing)]
+
+    mask = np.zeros((height, width), dtype=bool)
+    for x0, y0, row_period in lattices:
+        dx = _lattice_distance(xs, x0, spacing)
+        dy = _lattice_distance(ys, y0, row_period)
+        mask |= _disc_mask(dx, dy, dot_radius)
+    return _colorize(mask, bg_rgb, dot_rgb)
+
+
+def render_grid(width: int, height: int, grid_size: int, line_width: int, style: str,
+                bg_rgb: tuple, line_rgb: tuple) -> np.ndarray:
+    """
+    Grid lines as a float32 [H, W, 3] array in 0-1.
+
+    Lines sit on multiples of grid_size (up to and including the image size).
+    Dashed lines are 10 px on / 10 px off; dotted lines are dots of radius
+    line_width every 10 px.
+    """
+    xs = np.arange(width)
+    ys = np.arange(height)
+    # Distance to the nearest vertical / horizontal line
+    line_dx = _lattice_distance(xs, 0, grid_size, width)
+    line_dy = _lattice_distance(ys, 0, grid_size, height)
+
+    if style == "dotted":
+        dot_dx = _lattice_distance(xs, 0, 10, width - 1)
+        dot_dy = _lattice_distance(ys, 0, 10, height - 1)
+        mask = _disc_mask(line_dx, dot_dy, line_width) | _disc_mask(dot_dx, line_dy, line_width)
+    else:
+        half = line_width // 2
+        on_vertical = line_dx <= half
+        on_horizontal = line_dy <= half
+        if style == "dashed":
+            mask = (on_vertical[None, :] & (ys % 20 <= 10)[:, None]) | \
+                   (on_horizontal[:, None] & (xs % 20 <= 10)[None, :])
+        else:
+            mask = on_vertical[None, :] | on_horizontal[:, None]
+    return _colorize(mask, bg_rgb, line_rgb)
+
+
+def render_gradient(width: int, height: int, gradient_type: str, direction: str,
+                    rgb1: tuple, rgb2: tuple) -> np.ndarray:
+    """Gradient from rgb1 to rgb2 as a float32 [H, W, 3] array in 0-1."""
+    xs = np.arange(width, dtype=np.float64)
+    ys = np.arange(height, dtype=np.float64)
+
+    rgb1 = np.array(rgb1) / 255.0
+    rgb2 = np.array(rgb2) / 255.0
+
+    if gradient_type == "linear":
+        # Blend one row/column of colors and broadcast it over the other axis
+        if direction == "horizontal":
+            t = (xs / (width - 1))[None, :, None]
+        else:  # vertical
+            t = (ys / (height - 1))[:, None, None]
+        ramp = (rgb1 * (1 - t) + rgb2 * t).astype(np.float32)
+        return np.ascontiguousarray(np.broadcast_to(ramp, (height, width, 3)))
+
+    # Squared offsets are tabulated per axis; only the outer sum is [H, W],
+    # and every later step reuses that buffer in place
+    if gradient_type == "radial":
+        center_x, center_y = width // 2, height // 2
+        max_dist = math.sqrt(center_x**2 + center_y**2)
+        t = np.add.outer((ys - center_y) ** 2, (xs - center_x) ** 2)
+        np.sqrt(t, out=t)
+        t /= max_dist
+        np.minimum(t, 1.0, out=t)
+    elif gradient_type == "diagonal":
+        t = np.add.outer(ys, xs)
+        t /= (width + height - 2)
+    else:  # corner
+        t = np.add.outer((ys / (height - 1)) ** 2, (xs / (width - 1)) ** 2)
+        np.sqrt(t, out=t)
+        t /= math.sqrt(2)
+        np.minimum(t, 1.0, out=t)
+
+    # Blend one channel at a time through two [H, W] scratch buffers
+    inv_t = 1 - t
+    img = np.empty((height, width, 3), dtype=np.float32)
+    a = np.empty_like(t)
+    b = np.empty_like(t)
+    for c in range(3):
+        np.multiply(inv_t, rgb1[c], out=a)
+        np.multiply(t, rgb2[c], out=b)
+        a += b
+        img[..., c] = a
+    return img
+
+
+# Octave o is rendered at 1/2**o size and blended with weight 1/2**o
+CLOUD_OCTAVE_WEIGHTS = (1.0, 0.5, 0.25, 0.125)
+
+
+@njit(cache=True, nogil=True)
+def _accumulate_nearest_kernel(dst, src, src_y, src_x, weight):
+    for y in range(src_y.shape[0]):
+        row = src_y[y]
+        for x in range(src_x.shape[0]):
+            dst[y, x] += src[row, src_x[x]] * weight
+
+
+def warm_up_kernels():
+    """Compile the noise kernels on a 1x1 input (see utils.warm_up_in_background)."""
+    if not HAS_NUMBA:
+        return
+    # Octaves are contiguous or cropped views depending on size; indices come from np.arange
+    index = np.arange(1)
+    for octave in (np.zeros((1, 1)), np.zeros((2, 2))[:1, :1]):
+        _accumulate_nearest_kernel(np.zeros((1, 1)), octave, index, index, 0.5)
+
+
+def render_smooth_noise(width: int, height: int, seed: int) -> np.ndarray:
+    """Smooth noise as a float64 [H, W] array: 1/8-resolution random values, bilinearly upscaled."""
+    # Local generator (same stream as np.random.seed) so batch items can render in parallel
+    rng = np.random.RandomState(seed)
+    # Generate low-res noise
+    low_res = 8
+    low_width = width // low_res
+    low_height = height // low_res
+    low_noise = rng.random_sample((low_height + 1, low_width + 1))
+
+    # Bilinear upscale with corner-aligned sampling; the output size follows
+    # scipy.ndimage.zoom(order=1), which this used to call, so noise is unchanged
+    zoom_height = round((low_height + 1) * (height / low_height))
+    zoom_width = round((low_width + 1) * (width / low_width))
+    noise = F.interpolate(torch.from_numpy(low_noise)[None, None], size=(zoom_height, zoom_width),
+                          mode='bilinear', align_corners=True)[0, 0]
+    return noise[:height, :width].numpy()
+
+
+def render_cloud_noise(width: int, height: int, seed: int) -> np.ndarray:
+    """Cloud noise as a float64 [H, W] array: smooth-noise octaves, each half the size and weight."""
+    xs = np.arange(width)
+    ys = np.arange(height)
+    # Octave 0 is full size with weight 1, so it becomes the accumulator directly
+    cloud = np.ascontiguousarray(render_smooth_noise(width, height, seed))
+    for octave in range(1, len(CLOUD_OCTAVE_WEIGHTS)):
+        weight = CLOUD_OCTAVE_WEIGHTS[octave]
+        octave_noise = render_smooth_noise(width >> octave, height >> octave, seed + octave * 7)
+        # Nearest-neighbour upscale via precomputed source rows/columns
+        oct_h, oct_w = octave_noise.shape
+        src_y = np.minimum(ys * oct_h // height, oct_h - 1)
+        src_x = np.minimum(xs * oct_w // width, oct_w - 1)
+        if HAS_NUMBA:
+            # Gather and accumulate in one pass (power-of-two weight, so exact)
+            _accumulate_nearest_kernel(cloud, octave_noise, src_y, src_x, weight)
+        else:
+            upscaled = octave_noise[src_y[:, None], src_x[None, :]]
+            upscaled *= weight
+            cloud += upscaled
+    return cloud
+
+
+def render_noise(width: int, height: int, noise_type: str, intensity: float, seed: int,
+                 colored: bool) -> np.ndarray:
+    """
+    One Simple Noise frame as a float64 [H, W, 3] array clamped to 0-1.
+
+    Grayscale noise is returned as [H, W, 1]. Both are left in float64;
+    render_noise_batch() broadcasts to RGB and casts while copying into the
+    batch tensor, which saves a stacked copy and a separate float32 copy.
+    """
+    if noise_type == "random":
+        rng = np.random.RandomState(seed)
+        if colored:
+            noise_array = rng.random_sample((height, width, 3))
+            noise_array *= intensity
+        else:
+            noise_array = rng.random_sample((height, width, 1))
+            noise_array *= intensity
+
+    else:
+        # Smooth noise, or multiple smooth octaves for a cloud-like effect
+        render_channel = render_smooth_noise if noise_type == "smooth" else render_cloud_noise
+        if colored:
+            noise_array = np.empty((height, width, 3))
+            for c in range(3):
+                noise_array[..., c] = render_channel(width, height, seed + c * 33)
+            noise_array *= intensity
+        else:
+            noise_array = render_channel(width, height, seed)[..., None] * intensity
+
+    # Clamp values to 0-1
+    return np.clip(noise_array, 0, 1, out=noise_array)
+
+
+def render_noise_batch(width: int, height: int, noise_type: str, intensity: float, seed: int,
+                       colored: bool, batch_size: int) -> torch.Tensor:
+    """
+    Simple Noise batch as a [B, H, W, 3] float32 tensor; frame b uses seed + b * 100.
+
+    Frames are independent and NumPy/torch release the GIL, so they render on a thread pool.
+    """
+    result = torch.empty((batch_size, height, width, 3), dtype=torch.float32)
+
+    def render_frame(b):
+        # copy_ broadcasts grayscale to RGB and converts float64 -> float32
+        result[b].copy_(torch.from_numpy(render_noise(width, height, noise_type, intensity, seed + b * 100, colored)))
+
+    if batch_size == 1:
+        render_frame(0)
+    else:
+        with ThreadPoolExecutor(max_workers=min(batch_size, os.cpu_count() or 1)) as pool:
+            list(pool.map(render_frame, range(batch_size)))
+    return result
+
+
+# Unit flat-top hexagon vertices, clockwise from the rightmost point
+HEX_UNIT_VERTICES = tuple((math.cos(math.pi / 3 * i), math.sin(math.pi / 3 * i)) for i in range(6))
+
+
+def render_hexagons(width: int, height: int, hexagon_size: int, line_width: int, filled: bool,
+                    bg_rgb: tuple, hex_rgb: tuple, line_rgb: tuple) -> np.ndarray:
+    """
+    Honeycomb of flat-top hexagons as a uint8 [H, W, 3] array.
+
+    Rows are hexagon_size * sqrt(3) / 2 apart and odd rows are shifted by
+    1.5 * hexagon_size. Vertex offsets are scaled once, and each outline is
+    a single closed polyline rather than six separate line calls.
+    """
+    hex_height = hexagon_size * math.sqrt(3)
+    offsets = [(hexagon_size * ux, hexagon_size * uy) for ux, uy in HEX_UNIT_VERTICES]
+
+    img = Image.new('RGB', (width, height), bg_rgb)
+    draw = ImageDraw.Draw(img)
+
+    # Draw hexagons in a honeycomb pattern
+    row = 0
+    y = hexagon_size
+    while y < height + hexagon_size:
+        x = hexagon_size
+        if row % 2 == 1:
+            x += hexagon_size * 1.5
+
+        while x < width + hexagon_size:
+            vertices = [(x + dx, y + dy) for dx, dy in offsets]
+            if filled:
+                draw.polygon(vertices, fill=hex_rgb)
+            if line_width > 0:
+                draw.line(vertices + vertices[:1], fill=line_rgb, width=line_width)
+            x += hexagon_size * 3
+
+        y += hex_height / 2
+        row += 1
+
+    return np.array(img)
+
+
+def render_stripes(width: int, height: int, stripe_width: int, direction: str, rgb1: tuple, rgb2: tuple) -> np.ndarray:
+    """Stripes as a float32 [H, W, 3] array in 0-1; the first stripe is rgb1."""
+    xs = np.arange(width)
+    ys = np.arange(height)
+    if direction == "horizontal":
+        band = np.broadcast_to((ys // stripe_width)[:, None], (height, width))
+    elif direction == "vertical":
+        band = np.broadcast_to((xs // stripe_width)[None, :], (height, width))
+    elif direction == "diagonal_right":
+        # Stripes run top-left to bottom-right, along lines of constant x - y
+        band = (xs[None, :] - ys[:, None] + height) // stripe_width
+    else:  # diagonal_left
+        # Stripes run top-right to bottom-left, along lines of constant x + y
+        band = (xs[None, :] + ys[:, None] + stripe_width) // stripe_width
+    mask = (band & 1).astype(bool)
+    return _colorize(mask, rgb1, rgb2)
 
 
 class CheckerboardPattern:
@@ -30,28 +407,8 @@ class CheckerboardPattern:
     CATEGORY = "Purz/Patterns/Basic"
     
     def generate_pattern(self, width, height, square_size, color1, color2, batch_size):
-        result = []
-        
-        rgb1 = hex_to_rgb(color1)
-        rgb2 = hex_to_rgb(color2)
-        
-        for _ in range(batch_size):
-            img = Image.new('RGB', (width, height))
-            draw = ImageDraw.Draw(img)
-            
-            for y in range(0, height, square_size):
-                for x in range(0, width, square_size):
-                    if ((x // square_size) + (y // square_size)) % 2 == 0:
-                        color = rgb1
-                    else:
-                        color = rgb2
-                    draw.rectangle([x, y, x + square_size, y + square_size], fill=color)
-            
-            img_tensor = numpy_to_tensor(pil_to_numpy(img))
-            result.append(img_tensor)
-        
-        result = torch.stack(result)
-        return (result,)
+        img_np = render_checkerboard(width, height, square_size, hex_to_rgb(color1), hex_to_rgb(color2))
+        return (batch_pattern(img_np, batch_size),)
 
 
 class StripesPattern:
@@ -79,54 +436,8 @@ class StripesPattern:
     CATEGORY = "Purz/Patterns/Basic"
     
     def generate_pattern(self, width, height, stripe_width, direction, color1, color2, batch_size):
-        result = []
-        
-        rgb1 = hex_to_rgb(color1)
-        rgb2 = hex_to_rgb(color2)
-        
-        for _ in range(batch_size):
-            img = Image.new('RGB', (width, height))
-            draw = ImageDraw.Draw(img)
-            
-            if direction == "horizontal":
-                for y in range(0, height, stripe_width * 2):
-                    draw.rectangle([0, y, width, y + stripe_width], fill=rgb1)
-                    if y + stripe_width < height:
-                        draw.rectangle([0, y + stripe_width, width, min(y + stripe_width * 2, height)], fill=rgb2)
-            
-            elif direction == "vertical":
-                for x in range(0, width, stripe_width * 2):
-                    draw.rectangle([x, 0, x + stripe_width, height], fill=rgb1)
-                    if x + stripe_width < width:
-                        draw.rectangle([x + stripe_width, 0, min(x + stripe_width * 2, width), height], fill=rgb2)
-            
-            elif direction == "diagonal_right":
-                # Draw diagonal stripes (top-left to bottom-right)
-                for i in range(-height, width, stripe_width * 2):
-                    points = [(i, 0), (i + stripe_width, 0), 
-                             (i + stripe_width + height, height), (i + height, height)]
-                    draw.polygon(points, fill=rgb1)
-                    
-                    points2 = [(i + stripe_width, 0), (i + stripe_width * 2, 0),
-                              (i + stripe_width * 2 + height, height), (i + stripe_width + height, height)]
-                    draw.polygon(points2, fill=rgb2)
-            
-            else:  # diagonal_left
-                # Draw diagonal stripes (top-right to bottom-left)
-                for i in range(0, width + height, stripe_width * 2):
-                    points = [(i, 0), (i - height, height), 
-                             (max(0, i - height - stripe_width), height), (max(0, i - stripe_width), 0)]
-                    draw.polygon(points, fill=rgb1)
-                    
-                    points2 = [(min(width, i + stripe_width), 0), (i + stripe_width - height, height),
-                              (max(0, i - height), height), (i, 0)]
-                    draw.polygon(points2, fill=rgb2)
-            
-            img_tensor = numpy_to_tensor(pil_to_numpy(img))
-            result.append(img_tensor)
-        
-        result = torch.stack(result)
-        return (result,)
+        img_np = render_stripes(width, height, stripe_width, direction, hex_to_rgb(color1), hex_to_rgb(color2))
+        return (batch_pattern(img_np, batch_size),)
 
 
 class PolkaDotPattern:
@@ -155,35 +466,9 @@ class PolkaDotPattern:
     CATEGORY = "Purz/Patterns/Basic"
     
     def generate_pattern(self, width, height, dot_radius, spacing, background_color, dot_color, stagger, batch_size):
-        result = []
-        
-        bg_rgb = hex_to_rgb(background_color)
-        dot_rgb = hex_to_rgb(dot_color)
-        
-        for _ in range(batch_size):
-            img = Image.new('RGB', (width, height), bg_rgb)
-            draw = ImageDraw.Draw(img)
-            
-            y = spacing // 2
-            row = 0
-            while y < height + dot_radius:
-                x = spacing // 2
-                if stagger and row % 2 == 1:
-                    x += spacing // 2
-                
-                while x < width + dot_radius:
-                    draw.ellipse([x - dot_radius, y - dot_radius, 
-                                 x + dot_radius, y + dot_radius], fill=dot_rgb)
-                    x += spacing
-                
-                y += spacing
-                row += 1
-            
-            img_tensor = numpy_to_tensor(pil_to_numpy(img))
-            result.append(img_tensor)
-        
-        result = torch.stack(result)
-        return (result,)
+        img_np = render_polka_dots(width, height, dot_radius, spacing, stagger,
+                                   hex_to_rgb(background_color), hex_to_rgb(dot_color))
+        return (batch_pattern(img_np, batch_size),)
 
 
 class GridPattern:
@@ -212,42 +497,9 @@ class GridPattern:
     CATEGORY = "Purz/Patterns/Basic"
     
     def generate_pattern(self, width, height, grid_size, line_width, background_color, line_color, style, batch_size):
-        result = []
-        
-        bg_rgb = hex_to_rgb(background_color)
-        line_rgb = hex_to_rgb(line_color)
-        
-        for _ in range(batch_size):
-            img = Image.new('RGB', (width, height), bg_rgb)
-            draw = ImageDraw.Draw(img)
-            
-            # Draw vertical lines
-            for x in range(0, width + 1, grid_size):
-                if style == "solid":
-                    draw.rectangle([x - line_width//2, 0, x + line_width//2, height], fill=line_rgb)
-                elif style == "dashed":
-                    for y in range(0, height, 20):
-                        draw.rectangle([x - line_width//2, y, x + line_width//2, min(y + 10, height)], fill=line_rgb)
-                else:  # dotted
-                    for y in range(0, height, 10):
-                        draw.ellipse([x - line_width, y - line_width, x + line_width, y + line_width], fill=line_rgb)
-            
-            # Draw horizontal lines
-            for y in range(0, height + 1, grid_size):
-                if style == "solid":
-                    draw.rectangle([0, y - line_width//2, width, y + line_width//2], fill=line_rgb)
-                elif style == "dashed":
-                    for x in range(0, width, 20):
-                        draw.rectangle([x, y - line_width//2, min(x + 10, width), y + line_width//2], fill=line_rgb)
-                else:  # dotted
-                    for x in range(0, width, 10):
-                        draw.ellipse([x - line_width, y - line_width, x + line_width, y + line_width], fill=line_rgb)
-            
-            img_tensor = numpy_to_tensor(pil_to_numpy(img))
-            result.append(img_tensor)
-        
-        result = torch.stack(result)
-        return (result,)
+        img_np = render_grid(width, height, grid_size, line_width, style,
+                             hex_to_rgb(background_color), hex_to_rgb(line_color))
+        return (batch_pattern(img_np, batch_size),)
 
 
 class SimpleNoisePattern:
@@ -274,123 +526,8 @@ class SimpleNoisePattern:
     FUNCTION = "generate_pattern"
     CATEGORY = "Purz/Patterns/Noise"
     
-    def smooth_noise(self, width, height, seed):
-        """Generate smooth noise using interpolation"""
-        np.random.seed(seed)
-        # Generate low-res noise
-        low_res = 8
-        low_width = width // low_res
-        low_height = height // low_res
-        
-        # Create random values
-        low_noise = np.random.random((low_height + 1, low_width + 1))
-        
-        # Interpolate to full size
-        from scipy.ndimage import zoom
-        try:
-            noise = zoom(low_noise, (height / low_height, width / low_width), order=1)
-            return noise[:height, :width]
-        except ImportError:
-            # Fallback if scipy not available - simple bilinear interpolation
-            noise = np.zeros((height, width))
-            for y in range(height):
-                for x in range(width):
-                    # Find the surrounding low-res points
-                    lx = (x * low_width) // width
-                    ly = (y * low_height) // height
-                    fx = ((x * low_width) % width) / width
-                    fy = ((y * low_height) % height) / height
-                    
-                    # Bilinear interpolation
-                    lx = min(lx, low_width - 1)
-                    ly = min(ly, low_height - 1)
-                    
-                    tl = low_noise[ly, lx]
-                    tr = low_noise[ly, min(lx + 1, low_width)]
-                    bl = low_noise[min(ly + 1, low_height), lx]
-                    br = low_noise[min(ly + 1, low_height), min(lx + 1, low_width)]
-                    
-                    top = tl * (1 - fx) + tr * fx
-                    bottom = bl * (1 - fx) + br * fx
-                    noise[y, x] = top * (1 - fy) + bottom * fy
-            
-            return noise
-    
     def generate_pattern(self, width, height, noise_type, intensity, seed, colored, batch_size):
-        result = []
-        
-        for b in range(batch_size):
-            current_seed = seed + b * 100
-            
-            if noise_type == "random":
-                np.random.seed(current_seed)
-                if colored:
-                    noise_array = np.random.random((height, width, 3)) * intensity
-                else:
-                    noise_array = np.random.random((height, width)) * intensity
-                    noise_array = np.stack([noise_array] * 3, axis=2)
-            
-            elif noise_type == "smooth":
-                if colored:
-                    channels = []
-                    for c in range(3):
-                        channel_noise = self.smooth_noise(width, height, current_seed + c * 33)
-                        channels.append(channel_noise * intensity)
-                    noise_array = np.stack(channels, axis=2)
-                else:
-                    noise_array = self.smooth_noise(width, height, current_seed) * intensity
-                    noise_array = np.stack([noise_array] * 3, axis=2)
-            
-            else:  # cloudy
-                # Generate multiple octaves for cloud-like effect
-                if colored:
-                    channels = []
-                    for c in range(3):
-                        cloud = np.zeros((height, width))
-                        for octave in range(4):
-                            scale = 2 ** octave
-                            octave_noise = self.smooth_noise(width // scale, height // scale, current_seed + c * 33 + octave * 7)
-                            # Resize back to full size
-                            if octave_noise.shape != (height, width):
-                                # Simple nearest neighbor upscaling
-                                temp = np.zeros((height, width))
-                                for y in range(height):
-                                    for x in range(width):
-                                        src_y = min(y * octave_noise.shape[0] // height, octave_noise.shape[0] - 1)
-                                        src_x = min(x * octave_noise.shape[1] // width, octave_noise.shape[1] - 1)
-                                        temp[y, x] = octave_noise[src_y, src_x]
-                                octave_noise = temp
-                            
-                            cloud += octave_noise / (2 ** octave)
-                        channels.append(cloud * intensity)
-                    noise_array = np.stack(channels, axis=2)
-                else:
-                    cloud = np.zeros((height, width))
-                    for octave in range(4):
-                        scale = 2 ** octave
-                        octave_noise = self.smooth_noise(width // scale, height // scale, current_seed + octave * 7)
-                        # Simple nearest neighbor upscaling
-                        if octave_noise.shape != (height, width):
-                            temp = np.zeros((height, width))
-                            for y in range(height):
-                                for x in range(width):
-                                    src_y = min(y * octave_noise.shape[0] // height, octave_noise.shape[0] - 1)
-                                    src_x = min(x * octave_noise.shape[1] // width, octave_noise.shape[1] - 1)
-                                    temp[y, x] = octave_noise[src_y, src_x]
-                            octave_noise = temp
-                        
-                        cloud += octave_noise / (2 ** octave)
-                    
-                    noise_array = np.stack([cloud * intensity] * 3, axis=2)
-            
-            # Clamp values to 0-1
-            noise_array = np.clip(noise_array, 0, 1)
-            
-            img_tensor = torch.from_numpy(noise_array.astype(np.float32))
-            result.append(img_tensor)
-        
-        result = torch.stack(result)
-        return (result,)
+        return (render_noise_batch(width, height, noise_type, intensity, seed, colored, batch_size),)
 
 
 class HexagonPattern:
@@ -419,62 +556,11 @@ class HexagonPattern:
     FUNCTION = "generate_pattern"
     CATEGORY = "Purz/Patterns/Basic"
     
-    def draw_hexagon(self, draw, center_x, center_y, size, fill_color, line_color, line_width, filled):
-        # Calculate hexagon vertices
-        vertices = []
-        for i in range(6):
-            angle = math.pi / 3 * i
-            x = center_x + size * math.cos(angle)
-            y = center_y + size * math.sin(angle)
-            vertices.append((x, y))
-        
-        if filled and fill_color:
-            draw.polygon(vertices, fill=fill_color)
-        
-        if line_width > 0:
-            # Draw outline
-            for i in range(6):
-                next_i = (i + 1) % 6
-                draw.line([vertices[i], vertices[next_i]], fill=line_color, width=line_width)
-    
     def generate_pattern(self, width, height, hexagon_size, line_width, 
                         background_color, hexagon_color, line_color, filled, batch_size):
-        result = []
-        
-        bg_rgb = hex_to_rgb(background_color)
-        hex_rgb = hex_to_rgb(hexagon_color)
-        line_rgb = hex_to_rgb(line_color)
-        
-        # Calculate hexagon dimensions
-        hex_width = hexagon_size * 2
-        hex_height = hexagon_size * math.sqrt(3)
-        
-        for _ in range(batch_size):
-            img = Image.new('RGB', (width, height), bg_rgb)
-            draw = ImageDraw.Draw(img)
-            
-            # Draw hexagons in a honeycomb pattern
-            row = 0
-            y = hexagon_size
-            while y < height + hexagon_size:
-                x = hexagon_size
-                if row % 2 == 1:
-                    x += hexagon_size * 1.5
-                
-                while x < width + hexagon_size:
-                    self.draw_hexagon(draw, x, y, hexagon_size, 
-                                    hex_rgb if filled else None, 
-                                    line_rgb, line_width, filled)
-                    x += hexagon_size * 3
-                
-                y += hex_height / 2
-                row += 1
-            
-            img_tensor = numpy_to_tensor(pil_to_numpy(img))
-            result.append(img_tensor)
-        
-        result = torch.stack(result)
-        return (result,)
+        img_np = render_hexagons(width, height, hexagon_size, line_width, filled, hex_to_rgb(background_color),
+                                 hex_to_rgb(hexagon_color), hex_to_rgb(line_color))
+        return (batch_pattern(img_np, batch_size),)
 
 
 class GradientPattern:
@@ -502,52 +588,8 @@ class GradientPattern:
     CATEGORY = "Purz/Patterns/Basic"
     
     def generate_pattern(self, width, height, gradient_type, direction, color1, color2, batch_size):
-        result = []
-        
-        rgb1 = np.array(hex_to_rgb(color1)) / 255.0
-        rgb2 = np.array(hex_to_rgb(color2)) / 255.0
-        
-        for _ in range(batch_size):
-            img_np = np.zeros((height, width, 3), dtype=np.float32)
-            
-            if gradient_type == "linear":
-                if direction == "horizontal":
-                    for x in range(width):
-                        t = x / (width - 1)
-                        img_np[:, x] = rgb1 * (1 - t) + rgb2 * t
-                else:  # vertical
-                    for y in range(height):
-                        t = y / (height - 1)
-                        img_np[y, :] = rgb1 * (1 - t) + rgb2 * t
-            
-            elif gradient_type == "radial":
-                center_x, center_y = width // 2, height // 2
-                max_dist = math.sqrt(center_x**2 + center_y**2)
-                
-                for y in range(height):
-                    for x in range(width):
-                        dist = math.sqrt((x - center_x)**2 + (y - center_y)**2)
-                        t = min(dist / max_dist, 1.0)
-                        img_np[y, x] = rgb1 * (1 - t) + rgb2 * t
-            
-            elif gradient_type == "diagonal":
-                for y in range(height):
-                    for x in range(width):
-                        t = (x + y) / (width + height - 2)
-                        img_np[y, x] = rgb1 * (1 - t) + rgb2 * t
-            
-            else:  # corner
-                for y in range(height):
-                    for x in range(width):
-                        t = math.sqrt((x / (width - 1))**2 + (y / (height - 1))**2) / math.sqrt(2)
-                        t = min(t, 1.0)
-                        img_np[y, x] = rgb1 * (1 - t) + rgb2 * t
-            
-            img_tensor = torch.from_numpy(img_np)
-            result.append(img_tensor)
-        
-        result = torch.stack(result)
-        return (result,)
+        img_np = render_gradient(width, height, gradient_type, direction, hex_to_rgb(color1), hex_to_rgb(color2))
+        return (batch_pattern(img_np, batch_size),)
 
 
 # Pattern node mappings
@@ -0,0 +1,28 @@
+"""
+Pytest setup for ComfyUI-Purz.
+
+The node modules use package-relative imports and expect to run inside
+ComfyUI, so the repository root is registered as the ``purz`` package
+(without running ``__init__.py``) and a minimal ``folder_paths`` is provided
+when ComfyUI isn't importable.
+"""
+
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+try:
+    import folder_paths  # noqa: F401
+except ImportError:
+    folder_paths = types.ModuleType("folder_paths")
+    folder_paths.get_temp_directory = tempfile.gettempdir
+    folder_paths.get_output_directory = tempfile.gettempdir
+    sys.modules["folder_paths"] = folder_paths
+
+if "purz" not in sys.modules:
+    package = types.ModuleType("purz")
+    package.__path__ = [str(ROOT)]
+    sys.modules["purz"] = package
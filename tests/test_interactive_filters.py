@@ -0,0 +1,313 @@
+import base64
+import io
+import warnings
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+from purz import interactive_filters
+from purz.utils import numpy_to_tensor
+
+
+def _image(dtype=np.float32, shape=(48, 64, 3), seed=0):
+    return np.random.RandomState(seed).random_sample(shape).astype(dtype)
+
+
+def test_radial_blur_float64_matches_float32():
+    img = _image()
+    params = {"amount": 0.5}
+    expected = interactive_filters._filter_radialBlur(img, params, img)
+    img64 = img.astype(np.float64)
+    result = interactive_filters._filter_radialBlur(img64, params, img64)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, expected, atol=1e-6)
+
+
+def _png_data_url(frame_u8):
+    buffer = io.BytesIO()
+    Image.fromarray(frame_u8).save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def test_decode_rendered_frames_matches_numpy_to_tensor():
+    frames = [(_image(seed=seed) * 255).astype(np.uint8) for seed in range(3)]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        batch = interactive_filters._decode_rendered_frames([_png_data_url(f) for f in frames])
+    expected = torch.stack([numpy_to_tensor(f) for f in frames])
+    assert batch.dtype == torch.float32
+    assert torch.equal(batch, expected)
+
+
+def test_gpu_filter_stack_matches_numpy(monkeypatch):
+    pytest.importorskip("moderngl")
+    backend = interactive_filters._get_gpu_backend()
+    if backend is None:
+        pytest.skip("no OpenGL 3.3 context available")
+    img = _image()
+    layers = [
+        {"effect": "brightness", "params": {"amount": 0.1}, "opacity": 1.0},
+        {"effect": "contrast", "params": {"amount": 0.2}, "opacity": 0.75},
+        {"effect": "invert", "params": {"amount": 0.5}, "opacity": 1.0},
+    ]
+    monkeypatch.setattr(interactive_filters, "USE_GPU_FILTERS", False)
+    expected = interactive_filters.apply_filter_stack(img, layers)
+    monkeypatch.setattr(interactive_filters, "USE_GPU_FILTERS", True)
+    result = interactive_filters.apply_filter_stack(img, layers)
+    np.testing.assert_allclose(result, expected, atol=2e-3)
+
+
+def test_gpu_filter_stack_is_opt_in(monkeypatch):
+    def fail():
+        raise AssertionError("GPU backend requested without PURZ_GPU_FILTERS")
+
+    monkeypatch.setattr(interactive_filters, "USE_GPU_FILTERS", False)
+    monkeypatch.setattr(interactive_filters, "_get_gpu_backend", fail)
+    img = _image()
+    layers = [{"effect": "brightness", "params": {"amount": 0.1}, "opacity": 1.0}]
+    np.testing.assert_allclose(interactive_filters.apply_filter_stack(img, layers), np.clip(img + 0.1, 0, 1), atol=1e-6)
+
+
+def _to_u8(img):
+    return (img * 255).astype(np.uint8)
+
+
+def _stack_as_u8_reference(img_u8, layers):
+    img = img_u8.astype(np.float32) / 255.0
+    return interactive_filters._float_to_u8(interactive_filters.apply_filter_stack(img, layers))
+
+
+def test_u8_lut_stack_matches_float_stack():
+    img_u8 = _to_u8(_image(shape=(40, 56, 3)))
+    layers = [
+        {"effect": "brightness", "params": {"amount": 0.1}, "opacity": 1.0},
+        {"effect": "contrast", "params": {"amount": 0.3}, "opacity": 0.8},
+        {"effect": "temperature", "params": {"amount": 0.2}, "opacity": 1.0},
+        {"effect": "gamma", "params": {"amount": 1.4}, "opacity": 1.0},
+        {"effect": "curves", "params": {"shadows": 0.2, "midtones": -0.1, "highlights": 0.1}, "opacity": 1.0},
+        {"effect": "levels", "params": {"blackPoint": 0.05, "whitePoint": 0.9, "midtones": 1.2}, "opacity": 0.6},
+        {"effect": "invert", "params": {}, "opacity": 0.3},
+    ]
+    steps = interactive_filters._compile_stack_plan_u8(interactive_filters._stack_key(layers))
+    assert [kind for kind, _ in steps] == ["lut"]
+    result = interactive_filters.apply_filter_stack_u8(img_u8, layers)
+    assert result.dtype == np.uint8
+    # The LUT is the same float stack evaluated on a 0-255 ramp
+    np.testing.assert_array_equal(result, _stack_as_u8_reference(img_u8, layers))
+
+
+def test_u8_mixed_stack_within_one_level_of_float_stack():
+    img_u8 = _to_u8(_image(shape=(40, 56, 3)))
+    layers = [
+        {"effect": "brightness", "params": {"amount": 0.05}, "opacity": 1.0},
+        {"effect": "saturation", "params": {"amount": 0.3}, "opacity": 1.0},
+        {"effect": "gamma", "params": {"amount": 0.8}, "opacity": 1.0},
+    ]
+    steps = interactive_filters._compile_stack_plan_u8(interactive_filters._stack_key(layers))
+    assert [kind for kind, _ in steps] == ["lut", "float", "lut"]
+    result = interactive_filters.apply_filter_stack_u8(img_u8, layers)
+    expected = _stack_as_u8_reference(img_u8, layers)
+    # Frames are quantized to 8 bits between steps, the float stack only at the end
+    assert np.abs(result.astype(np.int16) - expected).max() <= 1
+
+
+def test_stored_layers_fallback_matches_u8_stack(monkeypatch):
+    layers = [
+        {"effect": "saturation", "params": {"amount": 0.4}, "opacity": 1.0, "enabled": True},
+        {"effect": "blur", "params": {"amount": 2.0}, "opacity": 0.5, "enabled": True},
+        {"effect": "vignette", "params": {"amount": 0.5}, "opacity": 1.0, "enabled": True},
+    ]
+    monkeypatch.setitem(interactive_filters.PURZ_FILTER_LAYERS, "7", layers)
+    batch_u8 = np.stack([_to_u8(_image(shape=(150, 40, 3), seed=seed)) for seed in range(2)])
+    result = interactive_filters._apply_stored_layers(batch_u8, "7")
+    expected = np.stack([interactive_filters.apply_filter_stack_u8(f, layers) for f in batch_u8])
+    assert result.dtype == torch.float32
+    assert torch.equal(result, torch.from_numpy(expected).float() / 255.0)
+
+
+def test_stored_layers_fallback_without_active_layers(monkeypatch):
+    batch_u8 = _to_u8(_image()[None])
+    assert interactive_filters._apply_stored_layers(batch_u8, "missing") is None
+    monkeypatch.setitem(interactive_filters.PURZ_FILTER_LAYERS, "7", [
+        {"effect": "brightness", "params": {"amount": 0.0}, "opacity": 1.0, "enabled": True},
+        {"effect": "blur", "params": {"amount": 3.0}, "opacity": 1.0, "enabled": False},
+    ])
+    assert interactive_filters._apply_stored_layers(batch_u8, "7") is None
+
+
+# Non-default params for every strip-safe effect (grain is random, so it's left out)
+STRIP_SAFE_PARAMS = {
+    "desaturate": {"amount": 0.6}, "brightness": {"amount": 0.1}, "contrast": {"amount": 0.3},
+    "exposure": {"amount": 0.4}, "gamma": {"amount": 1.3}, "vibrance": {"amount": 0.5},
+    "saturation": {"amount": 0.4}, "hueShift": {"amount": 0.2}, "temperature": {"amount": 0.3},
+    "tint": {"amount": -0.2}, "colorize": {"hue": 0.3, "saturation": 0.6},
+    "channelMixer": {"redShift": 0.1, "blueShift": -0.05}, "highlights": {"amount": 0.3},
+    "shadows": {"amount": 0.3}, "whites": {"amount": -0.2}, "blacks": {"amount": 0.2},
+    "levels": {"blackPoint": 0.1, "whitePoint": 0.8, "midtones": 1.3},
+    "curves": {"shadows": 0.2, "midtones": 0.1, "highlights": -0.1}, "dehaze": {"amount": 0.4},
+    "posterize": {"levels": 4}, "threshold": {"threshold": 0.4}, "invert": {"amount": 0.7},
+    "sepia": {"amount": 0.8}, "duotone": {}, "chromatic": {"amount": 3},
+    "blur": {"amount": 3.0}, "sharpen": {"amount": 1.0}, "unsharpMask": {"amount": 1.5},
+    "clarity": {"amount": 0.5}, "emboss": {}, "edgeDetect": {"amount": 1.0}, "sketch": {"amount": 4.0},
+    "oilPaint": {"radius": 3.0, "levels": 8},
+}
+
+# Params each FILTER_NOOPS entry treats as the identity
+IDENTITY_PARAMS = {
+    "desaturate": {"amount": 0}, "gamma": {"amount": 1}, "channelMixer": {}, "curves": {},
+    "levels": {"blackPoint": 0, "whitePoint": 1, "midtones": 1}, "lensDistort": {"amount": 0.001},
+    "tiltShift": {"blur": 0},
+}
+
+
+def _layer(effect, params, opacity=1.0):
+    return {"effect": effect, "params": params, "opacity": opacity, "enabled": True}
+
+
+def _plan(layers):
+    return interactive_filters._compile_stack_plan(interactive_filters._stack_key(layers))
+
+
+def test_strip_safe_params_cover_tiled_effects():
+    tiled = interactive_filters.ROW_LOCAL_FILTERS | set(interactive_filters.FILTER_HALOS)
+    assert set(STRIP_SAFE_PARAMS) == tiled - {"grain"}
+
+
+@pytest.mark.parametrize("effect", sorted(STRIP_SAFE_PARAMS))
+def test_tiled_layer_matches_whole_frame(effect):
+    # Tall enough for several strips even at the widest halo
+    img = _image(shape=(300, 40, 3))
+    params = STRIP_SAFE_PARAMS[effect]
+    halo = interactive_filters._layer_halo(effect, params)
+    run = ((effect, params, 0.75),)
+    tiled = interactive_filters._apply_layers_tiled(img, run, halo)
+    np.testing.assert_array_equal(tiled, interactive_filters._apply_layers(img, run))
+
+
+def test_tiled_run_matches_whole_frame():
+    img = _image(shape=(300, 40, 3))
+    layers = [_layer(effect, STRIP_SAFE_PARAMS[effect]) for effect in ("saturation", "blur", "curves", "sharpen", "emboss")]
+    plan = _plan(layers)
+    assert len(plan) == 1
+    run, halo = plan[0]
+    np.testing.assert_array_equal(
+        interactive_filters.apply_filter_stack(img, layers),
+        interactive_filters._apply_layers(img, run),
+    )
+
+
+def test_stack_plan_drops_noops_and_splits_at_whole_frame_effects():
+    layers = [
+        _layer("brightness", {"amount": 0.0}),
+        _layer("saturation", {"amount": 0.4}),
+        _layer("blur", {"amount": 2.0}, opacity=0.5),
+        _layer("contrast", {"amount": 0.3}, opacity=0.0),
+        _layer("vignette", {"amount": 0.5}),
+        dict(_layer("sepia", {"amount": 1.0}), enabled=False),
+        _layer("notAnEffect", {}),
+        _layer("contrast", {"amount": 0.2}),
+    ]
+    assert _plan(layers) == (
+        ((("saturation", {"amount": 0.4}, 1.0), ("blur", {"amount": 2.0}, 0.5)), interactive_filters._gaussian_halo(2.0)),
+        ((("vignette", {"amount": 0.5}, 1.0),), None),
+        ((("contrast", {"amount": 0.2}, 1.0),), 0),
+    )
+
+
+def test_stack_plan_folds_only_same_sign_full_opacity_layers():
+    folded = _plan([_layer("brightness", {"amount": 0.1}), _layer("brightness", {"amount": 0.2})])
+    assert folded == (((("brightness", {"amount": 0.1 + 0.2}, 1),), 0),)
+    for layers in (
+        [_layer("brightness", {"amount": 0.1}), _layer("brightness", {"amount": -0.2})],
+        [_layer("exposure", {"amount": 0.1}), _layer("exposure", {"amount": 0.2}, opacity=0.5)],
+        [_layer("contrast", {"amount": 0.1}), _layer("contrast", {"amount": 0.2})],
+    ):
+        assert len(_plan(layers)[0][0]) == 2
+
+
+@pytest.mark.parametrize("effect", sorted(interactive_filters.FILTER_FOLDS))
+@pytest.mark.parametrize("amounts", [(0.1, 0.25), (-0.3, -0.2)])
+def test_folded_layers_match_unfolded(effect, amounts):
+    img = _image()
+    layers = [_layer(effect, {"amount": amount}) for amount in amounts]
+    assert len(_plan(layers)[0][0]) == 1
+    unfolded = img
+    for amount in amounts:
+        unfolded = interactive_filters.apply_filter(unfolded, effect, {"amount": amount}, 1.0)
+    np.testing.assert_allclose(interactive_filters.apply_filter_stack(img, layers), unfolded, atol=1e-6)
+
+
+@pytest.mark.parametrize("effect", sorted(interactive_filters.FILTER_NOOPS))
+def test_noop_params_are_identity(effect):
+    img = _image()
+    params = IDENTITY_PARAMS.get(effect, {"amount": 0})
+    assert interactive_filters.FILTER_NOOPS[effect](params)
+    assert interactive_filters.apply_filter(img, effect, params, 1.0) is img
+    # The handler itself must agree that the layer changes nothing
+    result = interactive_filters.FILTER_REGISTRY[effect](img, params, img)
+    np.testing.assert_allclose(np.clip(result, 0, 1), img, atol=1e-6)
+
+
+
+@pytest.mark.parametrize("amount", [0, 0.6, -1, -4])
+def test_chromatic_without_positive_shift_is_noop(amount):
+    # The handler only shifts channels for amount >= 1 after int()
+    img = _image()
+    params = {"amount": amount}
+    assert interactive_filters.FILTER_NOOPS["chromatic"](params)
+    assert interactive_filters._filter_chromatic(img, params, img) is img
+    assert _plan([_layer("chromatic", params)]) == ()
+
+# Effects whose output is random, so only their inputs can be checked
+RANDOM_EFFECTS = {"grain", "glitch"}
+
+
+@pytest.mark.parametrize("effect", sorted(interactive_filters.FILTER_REGISTRY))
+@pytest.mark.parametrize("opacity", [1.0, 0.6])
+def test_apply_filter_leaves_input_and_matches_reference_blend(effect, opacity):
+    img = _image()
+    before = img.copy()
+    params = STRIP_SAFE_PARAMS.get(effect, {"amount": 0.4})
+    result = interactive_filters.apply_filter(img, effect, params, opacity)
+    np.testing.assert_array_equal(img, before)
+    assert result.dtype == np.float32 and result.shape == img.shape
+    if effect in RANDOM_EFFECTS:
+        return
+    filtered = np.asarray(interactive_filters.FILTER_REGISTRY[effect](img, params, img), dtype=np.float32)
+    np.testing.assert_array_equal(img, before)
+    expected = np.clip(img * (1 - opacity) + filtered * opacity, 0, 1)
+    np.testing.assert_allclose(result, expected, atol=1e-6)
+
+
+NUMBA_TONE_PARAMS = [
+    ("brightness", {"amount": 0.15}), ("brightness", {"amount": -0.3}),
+    ("contrast", {"amount": 0.4}), ("contrast", {"amount": -0.5}),
+    ("exposure", {"amount": 0.7}), ("exposure", {"amount": -1.0}),
+    ("vibrance", {"amount": 0.6}), ("vibrance", {"amount": -0.4}),
+    ("highlights", {"amount": 0.3}), ("shadows", {"amount": -0.3}),
+    ("whites", {"amount": 0.25}), ("blacks", {"amount": -0.25}),
+    ("curves", {"shadows": 0.3, "midtones": -0.2, "highlights": 0.4}),
+]
+
+
+@pytest.mark.parametrize("effect,params", NUMBA_TONE_PARAMS)
+def test_numba_tone_kernels_match_numpy(effect, params, monkeypatch):
+    if not interactive_filters.HAS_NUMBA:
+        pytest.skip("numba not installed")
+    img = _image()
+    assert interactive_filters._can_fuse(img)
+    fused = interactive_filters.FILTER_REGISTRY[effect](img, params, img)
+    monkeypatch.setattr(interactive_filters, "HAS_NUMBA", False)
+    reference = interactive_filters.FILTER_REGISTRY[effect](img, params, img)
+    assert fused.dtype == np.float32 and fused.shape == img.shape
+    # fastmath may reassociate the float32 arithmetic
+    np.testing.assert_allclose(fused, reference, atol=1e-5)
+
+
+def test_process_interactive_filter_empty_batch(tmp_path):
+    image = torch.zeros((0, 32, 32, 3))
+    output, results = interactive_filters.process_interactive_filter(image, "7", str(tmp_path), "temp", "", 1)
+    assert output is image
+    assert results == []
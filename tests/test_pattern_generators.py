@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from purz import pattern_generators
+
+BG = (10, 20, 30)
+FG = (200, 100, 50)
+
+
+def _as_float(img):
+    return np.asarray(img).astype(np.float32) / 255
+
+
+def _pil_polka_dots(width, height, dot_radius, spacing, stagger):
+    # Per-dot drawing loop of the original Polka Dot Pattern node
+    img = Image.new("RGB", (width, height), BG)
+    draw = ImageDraw.Draw(img)
+    y = spacing // 2
+    row = 0
+    while y < height + dot_radius:
+        x = spacing // 2
+        if stagger and row % 2 == 1:
+            x += spacing // 2
+        while x < width + dot_radius:
+            draw.ellipse([x - dot_radius, y - dot_radius, x + dot_radius, y + dot_radius], fill=FG)
+            x += spacing
+        y += spacing
+        row += 1
+    return _as_float(img)
+
+
+def _pil_dotted_grid(width, height, grid_size, line_width):
+    img = Image.new("RGB", (width, height), BG)
+    draw = ImageDraw.Draw(img)
+    for x in range(0, width + 1, grid_size):
+        for y in range(0, height, 10):
+            draw.ellipse([x - line_width, y - line_width, x + line_width, y + line_width], fill=FG)
+    for y in range(0, height + 1, grid_size):
+        for x in range(0, width, 10):
+            draw.ellipse([x - line_width, y - line_width, x + line_width, y + line_width], fill=FG)
+    return _as_float(img)
+
+
+@pytest.mark.parametrize("dot_radius", range(1, 25))
+@pytest.mark.parametrize("spacing,stagger", [(10, False), (17, True), (64, True)])
+def test_polka_dots_match_pil_ellipses(dot_radius, spacing, stagger):
+    result = pattern_generators.render_polka_dots(97, 83, dot_radius, spacing, stagger, BG, FG)
+    np.testing.assert_array_equal(result, _pil_polka_dots(97, 83, dot_radius, spacing, stagger))
+
+
+@pytest.mark.parametrize("line_width", range(1, 10))
+def test_dotted_grid_matches_pil_ellipses(line_width):
+    result = pattern_generators.render_grid(97, 83, 16, line_width, "dotted", BG, FG)
+    np.testing.assert_array_equal(result, _pil_dotted_grid(97, 83, 16, line_width))
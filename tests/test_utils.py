@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from purz import utils
+
+
+@pytest.fixture(params=[True, False], ids=["numba", "numpy"])
+def backend(request, monkeypatch):
+    if request.param and not utils.HAS_NUMBA:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(utils, "HAS_NUMBA", request.param)
+    return request.param
+
+
+def _hsv_with_bad_hues():
+    hsv = np.full((5, 3), 0.5)
+    hsv[:, 0] = [np.nan, np.inf, -np.inf, 0.25, 1.0]
+    return hsv
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_hsv_to_rgb_non_finite_hue(backend):
+    rgb = utils.hsv_to_rgb_vectorized(_hsv_with_bad_hues())
+    assert rgb.shape == (5, 3)
+    # Non-finite hues fall in sector 0 with an undefined fraction: R = V, B = P
+    np.testing.assert_array_equal(rgb[:3, 0], 0.5)
+    np.testing.assert_array_equal(rgb[:3, 2], 0.25)
+    assert np.isnan(rgb[:3, 1]).all()
+    np.testing.assert_allclose(rgb[3:], [[0.375, 0.5, 0.25], [0.5, 0.25, 0.25]])
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_hsv_to_rgb_backends_agree_on_non_finite_hue(monkeypatch):
+    if not utils.HAS_NUMBA:
+        pytest.skip("numba not installed")
+    hsv = _hsv_with_bad_hues()
+    fused = utils.hsv_to_rgb_vectorized(hsv)
+    monkeypatch.setattr(utils, "HAS_NUMBA", False)
+    np.testing.assert_array_equal(fused, utils.hsv_to_rgb_vectorized(hsv))
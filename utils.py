@@ -4,14 +4,55 @@ Common utility functions for ComfyUI-Purz nodes.
 This module centralizes frequently used helpers to avoid code duplication.
 """
 
+import functools
+import threading
+
 import torch
 import numpy as np
 from PIL import Image
 
+# Numba is optional. Without it `njit` is a no-op decorator and `prange` is
+# `range`, so callers should check HAS_NUMBA and keep a NumPy path.
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+def warm_up_in_background(*warm_ups):
+    """
+    Run Numba warm-up functions on a daemon thread.
+
+    The first call of each kernel compiles it (or loads it from Numba's
+    on-disk cache); doing that at startup keeps the delay off the first
+    node execution without blocking ComfyUI from loading.
+    """
+    if not HAS_NUMBA:
+        return
+
+    def run():
+        for warm_up in warm_ups:
+            try:
+                warm_up()
+            except Exception as e:
+                print(f"[Purz] Numba warm-up failed, kernels will compile on first use: {e}")
+
+    threading.Thread(target=run, name="purz-numba-warmup", daemon=True).start()
+
 
+@functools.lru_cache(maxsize=256)
 def hex_to_rgb(hex_color: str) -> tuple:
     """
     Convert a hex color string to RGB tuple.
+
+    Cached, since nodes re-parse the same few widget colors on every run.
     
     Args:
         hex_color: Hex color string (e.g., "#FF0000" or "FF0000")
@@ -19,8 +60,7 @@ def hex_to_rgb(hex_color: str) -> tuple:
     Returns:
         Tuple of (R, G, B) values in range 0-255
     """
-    hex_color = hex_color.lstrip('#')
-    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+    return tuple(bytes.fromhex(hex_color.lstrip('#')[:6]))
 
 
 def hex_to_rgb_normalized(hex_color: str) -> tuple:
@@ -79,7 +119,8 @@ def numpy_to_tensor(array: np.ndarray) -> torch.Tensor:
         PyTorch tensor [H, W, C] float32 in range 0-1
     """
     if array.dtype == np.uint8:
-        array = array.astype(np.float32) / 255.0
+        # Convert and scale in torch: one float32 allocation instead of two
+        return torch.from_numpy(np.ascontiguousarray(array)).to(torch.float32).div_(255.0)
     return torch.from_numpy(array.astype(np.float32))
 
 
@@ -109,8 +150,7 @@ def pil_to_tensor(img: Image.Image) -> torch.Tensor:
     """
     if img.mode != 'RGB':
         img = img.convert('RGB')
-    img_np = np.array(img).astype(np.float32) / 255.0
-    return torch.from_numpy(img_np)
+    return torch.from_numpy(pil_to_numpy(img))
 
 
 def pil_to_numpy(img: Image.Image) -> np.ndarray:
@@ -123,7 +163,10 @@ def pil_to_numpy(img: Image.Image) -> np.ndarray:
     Returns:
         NumPy array [H, W, C] float32 in range 0-1
     """
-    return np.array(img).astype(np.float32) / 255.0
+    # asarray reads PIL's buffer without an extra uint8 copy; scale in place
+    img_np = np.asarray(img).astype(np.float32)
+    img_np /= 255.0
+    return img_np
 
 
 def numpy_uint8_to_pil(array: np.ndarray) -> Image.Image:
@@ -144,7 +187,87 @@ def numpy_uint8_to_pil(array: np.ndarray) -> Image.Image:
 # =============================================================================
 # These functions operate on entire arrays without Python loops for performance.
 
-def rgb_to_hsv_vectorized(rgb: np.ndarray) -> np.ndarray:
+# With Numba the conversions run as single-pass per-pixel kernels over an
+# (N, 3) view; the NumPy versions below are the fallback. Each call runs on one
+# thread (no prange) and releases the GIL; the only parallelism comes from the
+# interactive filter stack, which tiles Hue Shift and Colorize into row strips
+# on its thread pool (interactive_filters._apply_layers_tiled).
+
+@njit(cache=True, nogil=True)
+def _rgb_to_hsv_kernel(px, out):
+    for i in range(px.shape[0]):
+        r, g, b = px[i, 0], px[i, 1], px[i, 2]
+        maxc = max(r, g, b)
+        delta = maxc - min(r, g, b)
+        h = 0.0
+        if delta > 0:
+            if maxc == r:
+                h = (g - b) / delta
+                if h < 0:
+                    h += 6.0
+            elif maxc == g:
+                h = (b - r) / delta + 2.0
+            else:
+                h = (r - g) / delta + 4.0
+        out[i, 0] = h / 6.0
+        out[i, 1] = delta / maxc if maxc > 0 else 0.0
+        out[i, 2] = maxc
+
+
+@njit(cache=True, nogil=True)
+def _hsv_to_rgb_kernel(px, out):
+    for i in range(px.shape[0]):
+        h = px[i, 0]
+        h6 = (h - np.floor(h)) * 6.0
+        s, v = px[i, 1], px[i, 2]
+        sector = min(max(int(h6), 0), 5)
+        f = h6 - sector
+        p = v * (1.0 - s)
+        q = v * (1.0 - s * f)
+        t = v * (1.0 - s * (1.0 - f))
+        if sector == 0:
+            r, g, b = v, t, p
+        elif sector == 1:
+            r, g, b = q, v, p
+        elif sector == 2:
+            r, g, b = p, v, t
+        elif sector == 3:
+            r, g, b = p, q, v
+        elif sector == 4:
+            r, g, b = t, p, v
+        else:
+            r, g, b = v, p, q
+        out[i, 0] = r
+        out[i, 1] = g
+        out[i, 2] = b
+
+
+def _as_float_array(arr):
+    """Return arr as float32/float64 (kept as-is) or promote it to float32."""
+    arr = np.asarray(arr)
+    if arr.dtype not in (np.float32, np.float64):
+        arr = arr.astype(np.float32)
+    return arr
+
+
+def _run_color_kernel(kernel, arr, out):
+    """Run a conversion kernel over float [..., 3] arrays viewed as (N, 3)."""
+    if out is None:
+        out = np.empty(arr.shape, dtype=arr.dtype)
+    # Kernels read each pixel before writing it, so out may be arr itself
+    out_px = out.reshape(-1, 3)
+    kernel(np.ascontiguousarray(arr).reshape(-1, 3), out_px)
+    if not np.may_share_memory(out_px, out):
+        # out's layout can't be flattened without a copy
+        out[...] = out_px.reshape(out.shape)
+    return out
+
+
+# Hue offset (in sixths) for a red, green or blue maximum
+HSV_HUE_OFFSETS = np.array([0.0, 2.0, 4.0], dtype=np.float32)
+
+
+def rgb_to_hsv_vectorized(rgb: np.ndarray, out: np.ndarray = None) -> np.ndarray:
     """
     Convert RGB array to HSV using vectorized NumPy operations.
 
@@ -152,49 +275,65 @@ def rgb_to_hsv_vectorized(rgb: np.ndarray) -> np.ndarray:
 
     Args:
         rgb: NumPy array [..., 3] with RGB values in range 0-1
+        out: Optional array of the same shape to write the result into; may be rgb
 
     Returns:
-        NumPy array [..., 3] with HSV values (H in 0-1, S in 0-1, V in 0-1)
+        NumPy array [..., 3] with HSV values (H in 0-1, S in 0-1, V in 0-1),
+        float64 for float64 input and float32 otherwise
     """
-    rgb = np.asarray(rgb)
+    rgb = _as_float_array(rgb)
+    if HAS_NUMBA:
+        return _run_color_kernel(_rgb_to_hsv_kernel, rgb, out)
 
     r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
 
     maxc = np.maximum(np.maximum(r, g), b)
     minc = np.minimum(np.minimum(r, g), b)
 
-    v = maxc
-
-    # Avoid division by zero
     delta = maxc - minc
-    s = np.where(maxc > 0, delta / maxc, 0)
 
-    # Calculate hue
-    # Initialize hue to 0
-    h = np.zeros_like(maxc)
-
-    # Where delta > 0, calculate hue based on which channel is max
+    # Hue: sector 0/1/2 = red/green/blue is max (tied channels give the same
+    # hue), then one choose for the numerator and one divide
     mask = delta > 0
+    not_red = maxc != r
+    sector = not_red.view(np.uint8) + (not_red & (maxc != g)).view(np.uint8)
+    h = np.divide(np.choose(sector, (g - b, b - r, r - g)), delta,
+                  out=np.zeros_like(delta), where=mask)
+    np.add(h, HSV_HUE_OFFSETS[sector], out=h, where=mask)
 
-    # Red is max
-    red_max = mask & (maxc == r)
-    h = np.where(red_max, ((g - b) / delta) % 6, h)
-
-    # Green is max
-    green_max = mask & (maxc == g)
-    h = np.where(green_max, ((b - r) / delta) + 2, h)
+    # Wrap red-max hues from [-1, 0) into [5, 6); equivalent to % 6 here
+    np.add(h, 6.0, out=h, where=h < 0)
 
-    # Blue is max
-    blue_max = mask & (maxc == b)
-    h = np.where(blue_max, ((r - g) / delta) + 4, h)
+    # Write H, S, V straight into the output. Hue goes first: out may be rgb,
+    # and r, g, b are not read again after it
+    if out is None:
+        out = np.empty(rgb.shape, dtype=rgb.dtype)
 
     # Normalize hue to 0-1 range
-    h = h / 6.0
+    np.divide(h, 6.0, out=out[..., 0])
+
+    # Avoid division by zero
+    s = out[..., 1]
+    s[...] = 0
+    np.divide(delta, maxc, out=s, where=maxc > 0)
+
+    out[..., 2] = maxc
+    return out
 
-    return np.stack([h, s, v], axis=-1)
 
+# Indices into (v, q, p, t) giving R, G, B for each hue sector:
+# 0: v,t,p  1: q,v,p  2: p,v,t  3: p,q,v  4: t,p,v  5: v,p,q
+HSV_SECTOR_SOURCES = np.array([
+    [0, 3, 2],
+    [1, 0, 2],
+    [2, 0, 3],
+    [2, 1, 0],
+    [3, 2, 0],
+    [0, 2, 1],
+], dtype=np.int8)
 
-def hsv_to_rgb_vectorized(hsv: np.ndarray) -> np.ndarray:
+
+def hsv_to_rgb_vectorized(hsv: np.ndarray, out: np.ndarray = None) -> np.ndarray:
     """
     Convert HSV array to RGB using vectorized NumPy operations.
 
@@ -202,48 +341,41 @@ def hsv_to_rgb_vectorized(hsv: np.ndarray) -> np.ndarray:
 
     Args:
         hsv: NumPy array [..., 3] with HSV values (H in 0-1, S in 0-1, V in 0-1)
+        out: Optional array of the same shape to write the result into; may be hsv
 
     Returns:
-        NumPy array [..., 3] with RGB values in range 0-1
+        NumPy array [..., 3] with RGB values in range 0-1, float64 for
+        float64 input and float32 otherwise
     """
-    hsv = np.asarray(hsv)
+    hsv = _as_float_array(hsv)
+    if HAS_NUMBA:
+        return _run_color_kernel(_hsv_to_rgb_kernel, hsv, out)
 
     h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
 
-    # Sector index (0-5)
-    i = (h * 6.0).astype(np.int32) % 6
+    # Wrap hue into [0, 1) like the frontend shaders' fract(); a no-op for
+    # hues already in range
+    h6 = h - np.floor(h)
+    h6 *= 6.0
+
+    # Sector index (0-5), clamped instead of taking % 6 of every pixel. The
+    # lower bound catches NaN/Inf hues, which cast to INT_MIN
+    i = np.clip(h6.astype(np.int32), 0, 5)
 
     # Fractional part
-    f = (h * 6.0) - np.floor(h * 6.0)
-
-    p = v * (1.0 - s)
-    q = v * (1.0 - s * f)
-    t = v * (1.0 - s * (1.0 - f))
-
-    # Build RGB based on sector
-    # Sector 0: v, t, p
-    # Sector 1: q, v, p
-    # Sector 2: p, v, t
-    # Sector 3: p, q, v
-    # Sector 4: t, p, v
-    # Sector 5: v, p, q
-
-    r = np.select(
-        [i == 0, i == 1, i == 2, i == 3, i == 4, i == 5],
-        [v, q, p, p, t, v],
-        default=v
-    )
-
-    g = np.select(
-        [i == 0, i == 1, i == 2, i == 3, i == 4, i == 5],
-        [t, v, v, q, p, p],
-        default=p
-    )
-
-    b = np.select(
-        [i == 0, i == 1, i == 2, i == 3, i == 4, i == 5],
-        [p, p, t, v, v, q],
-        default=p
-    )
-
-    return np.stack([r, g, b], axis=-1)
+    f = np.subtract(h6, i, dtype=h6.dtype)
+
+    # Write v, q, p, t straight into one [..., 4] buffer, then gather each
+    # pixel's R, G, B from it in one pass (instead of an np.select per
+    # channel that tests every sector) directly into the output
+    channels = np.empty(v.shape + (4,), dtype=v.dtype)
+    channels[..., 0] = v
+    np.multiply(v, 1.0 - s * f, out=channels[..., 1])
+    np.multiply(v, 1.0 - s, out=channels[..., 2])
+    np.multiply(v, 1.0 - s * (1.0 - f), out=channels[..., 3])
+
+    sources = HSV_SECTOR_SOURCES[i].astype(np.intp)
+    sources += np.arange(0, channels.size, 4).reshape(v.shape + (1,))
+    if out is None:
+        out = np.empty(hsv.shape, dtype=hsv.dtype)
+    return np.take(channels.reshape(-1), sources, out=out, mode='clip')